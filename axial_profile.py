@@ -0,0 +1,97 @@
+"""
+Непрерывные профили параметров плазмы вдоль канала СПД.
+
+Измеренные входные величины (в трех точках distances) интерполируются на плотную
+осевую сетку монотонным кубическим сплайном PCHIP: положительные величины — в
+логарифмическом масштабе (профиль остается положительным и не имеет выбросов между
+узлами), потенциал плазмы — в линейном. На сетке за один векторный проход считается
+вся цепочка calculations.py, а затем производные по координате: градиенты выбранных
+величин и напряженность поля E = -dφ/dx. Результат — словарь столбцов, который можно
+сохранить в столбцовое хранилище (results_store.save_values).
+
+Профиль опирается всего на три точки измерений, поэтому градиенты — это оценка
+гладкого профиля между ними, а не измеренные величины.
+"""
+import time
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+from calculations import MEASUREMENT_INPUTS, QUANTITIES, compute_plasma_state, distances
+
+# Входные величины, которые интерполируются в линейном масштабе (остальные — в логарифмическом)
+LINEAR_INPUTS = ("plasm_potential",)
+
+# Величины, для которых по умолчанию считаются градиенты (столбцы grad_<имя>, на метр)
+PROFILE_GRADIENTS = (
+    "electron_concentration",
+    "neutral_concentration",
+    "magnet_field",
+    "electron_temperature",
+)
+
+
+def axial_grid(points=10 ** 5, start=None, stop=None):
+    """Равномерная осевая сетка в мм (по умолчанию между крайними точками измерений)"""
+    start = distances.min() if start is None else start
+    stop = distances.max() if stop is None else stop
+    return np.linspace(start, stop, points)
+
+
+def interpolate_inputs(x, inputs=MEASUREMENT_INPUTS, nodes=distances):
+    """Входные столбцы на сетке x (мм) по значениям inputs в точках nodes"""
+    columns = {}
+    for name, value in inputs.items():
+        value = np.asarray(value, dtype=np.float64)
+        if name in LINEAR_INPUTS:
+            columns[name] = PchipInterpolator(nodes, value, extrapolate=False)(x)
+        else:
+            columns[name] = np.exp(PchipInterpolator(nodes, np.log(value), extrapolate=False)(x))
+    return columns
+
+
+def axial_profile(points=10 ** 5, outputs=None, gradients=PROFILE_GRADIENTS, inputs=MEASUREMENT_INPUTS,
+                  nodes=distances, dtype=np.float64):
+    """
+    Профили входных и производных величин на осевой сетке из points точек.
+
+    outputs — производные величины (по умолчанию все из QUANTITIES), gradients — величины
+    (входные или производные), для которых считаются градиенты grad_<имя> в единицах
+    величины на метр. Возвращает словарь столбцов: "distances" (мм), входные величины,
+    outputs, градиенты и "electric_field" — E = -dφ/dx (В/м).
+    """
+    x = axial_grid(points, nodes.min(), nodes.max())
+    columns = interpolate_inputs(x, inputs, nodes)
+    if outputs is None:
+        outputs = list(QUANTITIES)
+    needed = [name for name in gradients if name not in columns]
+    state = compute_plasma_state(columns, list(dict.fromkeys(list(outputs) + needed)), dtype)
+
+    profile = {"distances": x}
+    profile.update(columns)
+    profile.update((name, state[name]) for name in outputs)
+
+    # все производные одним вызовом np.gradient по общей оси (мм -> м)
+    names = list(gradients) + ["plasm_potential"]
+    values = np.stack([columns[name] if name in columns else state[name] for name in names])
+    derivatives = np.gradient(values, x * 1e-3, axis=1)
+    for name, derivative in zip(gradients, derivatives):
+        profile[f"grad_{name}"] = derivative
+    profile["electric_field"] = -derivatives[-1]
+    return profile
+
+
+if __name__ == "__main__":
+    from results_store import save_values
+
+    started = time.perf_counter()
+    profile = axial_profile(10 ** 5)
+    elapsed = time.perf_counter() - started
+    print(f"Профиль: {len(profile['distances'])} точек, {len(profile)} столбцов за {elapsed * 1e3:.1f} мс")
+
+    for name in ("electron_concentration", "electron_hall_parameter", "grad_magnet_field", "electric_field"):
+        column = profile[name]
+        print(f"  {name}: от {column.min():.3e} до {column.max():.3e}")
+
+    save_values("axial_profile_results", profile)
+    print("Профиль сохранен в хранилище 'axial_profile_results'")
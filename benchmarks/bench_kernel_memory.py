@@ -0,0 +1,74 @@
+"""
+Сравнение пиковой памяти (RSS) слитной цепочки kernels.transport_chain с обычным расчетом
+compute_plasma_state для тех же выходных величин (параметры Холла и поперечная
+электропроводность, как в развертках).
+
+Каждый режим запускается в отдельном процессе; прирост пикового RSS считается относительно
+процесса с уже созданными входными столбцами. Рабочая память — прирост за вычетом самих
+выходных массивов, которые нужны в любом режиме. Режим naive-all — расчет всех величин
+графа, как до появления выборочного расчета. Код возврата 1 — если выигрыш по рабочей
+памяти относительно naive меньше порога (по умолчанию 3x).
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from common import make_inputs, peak_rss, reset_peak_rss
+
+OUTPUTS = ("electron_hall_parameter", "ion_hall_parameter", "electric_conductivity_transversal")
+
+
+def run_mode(mode, n):
+    """Выполняет один режим в текущем процессе и возвращает время и прирост пиковой памяти"""
+    from calculations import compute_plasma_state
+    from kernels import transport_chain
+
+    inputs = make_inputs(n)
+    baseline = reset_peak_rss()
+    started = time.perf_counter()
+    if mode == "fused":
+        result = transport_chain(inputs, OUTPUTS)
+    elif mode == "naive":
+        result = compute_plasma_state(inputs, OUTPUTS)
+    else:
+        result = compute_plasma_state(inputs)
+    elapsed = time.perf_counter() - started
+    peak_increase = peak_rss() - baseline
+    output_bytes = sum(result[name].nbytes for name in OUTPUTS)
+    return {"mode": mode, "n": n, "seconds": elapsed, "peak_increase_bytes": peak_increase,
+            "working_bytes": max(0, peak_increase - output_bytes)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=2_000_000)
+    parser.add_argument("--min-ratio", type=float, default=3.0)
+    parser.add_argument("--mode", choices=("naive-all", "naive", "fused"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.n)))
+        return 0
+
+    results = {}
+    for mode in ("naive-all", "naive", "fused"):
+        run = subprocess.run([sys.executable, __file__, "--mode", mode, "--n", str(args.n)],
+                             capture_output=True, text=True, check=True)
+        results[mode] = json.loads(run.stdout)
+        print(f"{mode:>9}: {results[mode]['seconds']:.3f} с, "
+              f"прирост пикового RSS {results[mode]['peak_increase_bytes'] / 2 ** 20:.1f} МБ, "
+              f"рабочая память {results[mode]['working_bytes'] / 2 ** 20:.1f} МБ")
+
+    fused = results["fused"]
+    for mode in ("naive-all", "naive"):
+        print(f"Выигрыш относительно {mode}: пиковый RSS "
+              f"{results[mode]['peak_increase_bytes'] / max(1, fused['peak_increase_bytes']):.1f}x, "
+              f"рабочая память {results[mode]['working_bytes'] / max(1, fused['working_bytes']):.1f}x")
+    ratio = results["naive"]["working_bytes"] / max(1, fused["working_bytes"])
+    return 0 if ratio >= args.min_ratio else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Бенчмарк времени импорта calculations.py.
+
+Импорт модуля не должен ничего считать и печатать: проверяется, что stdout пуст,
+а время импорта сверх импорта NumPy не превышает порога (по умолчанию 50 мс).
+Код возврата 1 означает регрессию.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = (
+    "import time\n"
+    "t0 = time.perf_counter()\n"
+    "import numpy\n"
+    "t1 = time.perf_counter()\n"
+    "import calculations\n"
+    "t2 = time.perf_counter()\n"
+    "import sys\n"
+    "sys.stderr.write(f'{t1 - t0} {t2 - t1}\\n')\n"
+)
+
+
+def measure_import(repeat=5):
+    """Минимальные по repeat запускам времена импорта NumPy и calculations (с) и вывод импорта"""
+    numpy_times, module_times, output = [], [], ""
+    for _ in range(repeat):
+        run = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+        numpy_time, module_time = map(float, run.stderr.split()[-2:])
+        numpy_times.append(numpy_time)
+        module_times.append(module_time)
+        output = run.stdout
+    return min(numpy_times), min(module_times), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threshold-ms", type=float, default=50.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    numpy_time, module_time, output = measure_import(args.repeat)
+    print(f"Импорт NumPy: {numpy_time * 1e3:.1f} мс")
+    print(f"Импорт calculations (сверх NumPy): {module_time * 1e3:.1f} мс")
+
+    failed = False
+    if output:
+        print(f"ОШИБКА: импорт печатает в stdout:\n{output}")
+        failed = True
+    if module_time * 1e3 > args.threshold_ms:
+        print(f"ОШИБКА: время импорта превышает порог {args.threshold_ms:.0f} мс")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Общие средства бенчмарков: путь к корню проекта, замер пикового RSS и входные данные.
+"""
+import os
+import resource
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def reset_peak_rss():
+    """Сбрасывает пиковый RSS процесса (Linux); возвращает текущий RSS (байт)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss():
+    """Пиковый RSS процесса (байт)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def make_inputs(n, seed=0):
+    """N точек вокруг трех точек измерений с разбросом ±10 %"""
+    import numpy as np
+    from calculations import INPUT_COLUMNS, MEASUREMENT_INPUTS
+
+    rng = np.random.default_rng(seed)
+    index = rng.integers(0, 3, n)
+    inputs = {name: MEASUREMENT_INPUTS[name][index] * rng.uniform(0.9, 1.1, n) for name in INPUT_COLUMNS}
+    inputs["plasm_potential"] = np.minimum(inputs["plasm_potential"], 199.5)
+    return inputs
@@ -0,0 +1,227 @@
+"""
+Набор бенчмарков всех вычислительных путей проекта с кривыми масштабирования.
+
+Каждый замер (случай и размер задачи) выполняется в отдельном процессе, чтобы пиковый
+RSS не зависел от предыдущих замеров. Записываются время (лучшее из --repeat запусков),
+пропускная способность (точек или кривых в секунду) и прирост пикового RSS,
+а также время импорта calculations. Результаты сохраняются в results/<коммит>.json и
+сравниваются с предыдущим файлом (или --baseline): падение пропускной способности или
+рост памяти больше --threshold считается регрессией (код возврата 1).
+
+Случаи:
+  chain    — цепочка calculations.compute_plasma_state, N точек; считаются только величины
+             разверток (sweep.SWEEP_OUTPUTS) и их зависимости, а не весь граф;
+  sweep    — sweep.run_sweep по сетке 4 осей (≈N точек) с записью в столбцовое хранилище;
+  workers  — та же развертка по сетке ≈10^6 точек в пуле из N процессов
+             (масштабирование по числу процессов; пиковый RSS — только основного процесса);
+  probe    — lab/probe.analyse_sweeps для N модельных ВАХ;
+  emission — emission.cathode_maps на сетке N = n×n;
+  render   — graphics_results.render_pages, 3 листа по N точек в каждом ряду;
+             пропускная способность — точек ряда в секунду, а не листов.
+
+Временные каталоги разверток и листов удаляются после замера.
+"""
+import argparse
+import contextlib
+import datetime
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT, make_inputs, peak_rss, reset_peak_rss
+
+sys.path.insert(0, os.path.join(ROOT, "lab"))
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Размеры задач по умолчанию и в полном наборе (--full)
+SIZES = {
+    "chain": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+    "sweep": [10 ** 4, 10 ** 5, 10 ** 6],
+    "workers": [1, 2, 4],
+    "probe": [10 ** 2, 10 ** 3, 10 ** 4],
+    "emission": [100 ** 2, 300 ** 2, 1000 ** 2],
+    "render": [10 ** 2, 10 ** 4, 10 ** 6],
+}
+FULL_SIZES = dict(SIZES, chain=SIZES["chain"] + [10 ** 7], sweep=SIZES["sweep"] + [10 ** 7])
+
+# Размер сетки в случае workers
+WORKERS_POINTS = 10 ** 6
+
+
+def _prepare(case, n, stack):
+    """
+    Готовит данные; возвращает функцию одного запуска и число обрабатываемых элементов.
+    Временные каталоги регистрируются в stack (contextlib.ExitStack) и удаляются при его закрытии.
+    """
+    if case == "chain":
+        from calculations import compute_plasma_state
+        from sweep import SWEEP_OUTPUTS
+        inputs = make_inputs(n)
+        return lambda: compute_plasma_state(inputs, SWEEP_OUTPUTS), n
+
+    if case in ("sweep", "workers"):
+        import numpy as np
+        from sweep import run_sweep
+        # для workers N — число процессов, размер сетки фиксирован
+        points, workers = (n, 1) if case == "sweep" else (WORKERS_POINTS, n)
+        side = round(points ** 0.25)
+        axes = {
+            "magnet_field": np.linspace(5, 200, side),
+            "electron_temperature": np.linspace(2, 10, side),
+            "plasm_potential": np.linspace(50, 195, side),
+            "volume_flow": np.linspace(0.3e-6, 1.0e-6, side),
+        }
+        base = {"electron_current": 0.5, "ion_current": 2.19, "elastic_en_time": 1.84e-7,
+                "nonelastic_en_time": 2.44e-6, "neutral_concentration": 2.84e18}
+        out_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench_sweep_"))
+        return lambda: run_sweep(axes, base, out_dir, workers=workers, verbose=False), side ** 4
+
+    if case == "probe":
+        from probe import analyse_sweeps, synthetic_sweeps
+        U, I, _ = synthetic_sweeps(n, seed=0)
+        return lambda: analyse_sweeps(U, I), n
+
+    if case == "emission":
+        import numpy as np
+        from emission import cathode_maps
+        side = round(n ** 0.5)
+        T, E = np.linspace(800, 2000, side), np.logspace(4, 7, side)
+        return lambda: cathode_maps(T, E), side ** 2
+
+    if case == "render":
+        import graphics_results
+        from calculations import compute_plasma_state
+        inputs = make_inputs(n)
+        values = compute_plasma_state(inputs, graphics_results.PLOT_QUANTITIES)
+        values.update(x=inputs["magnet_field"], xlabel="Магнитное поле, Гс")
+        out_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench_render_"))
+        run = lambda: graphics_results.render_pages({"": values}, out_dir, workers=1, dpi=100,
+                                                    incremental=False)
+        return run, n
+
+    raise ValueError(f"Неизвестный случай: {case}")
+
+
+def run_case(case, n, repeat):
+    """Замер одного случая в текущем процессе"""
+    with contextlib.ExitStack() as stack:
+        run, count = _prepare(case, n, stack)
+        baseline = reset_peak_rss()
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+    return {"n": n, "seconds": best, "items": count, "throughput": count / best, "peak_rss_bytes": peak_rss() - baseline}
+
+
+def measure_startup():
+    """Время импорта calculations сверх импорта NumPy (с)"""
+    from bench_startup import measure_import
+    numpy_time, module_time, _ = measure_import()
+    return {"numpy_seconds": numpy_time, "calculations_seconds": module_time}
+
+
+def commit_id():
+    """Короткий хэш текущего коммита (с пометкой -dirty при незафиксированных изменениях)"""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    if git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+    return commit
+
+
+def find_regressions(current, baseline, threshold):
+    """Список описаний регрессий current относительно baseline"""
+    regressions = []
+    for case, points in current["cases"].items():
+        previous = {point["n"]: point for point in baseline.get("cases", {}).get(case, [])}
+        for point in points:
+            old = previous.get(point["n"])
+            if old is None:
+                continue
+            if point["throughput"] < old["throughput"] * (1 - threshold):
+                regressions.append(f"{case} N={point['n']}: пропускная способность "
+                                   f"{old['throughput']:.3g} -> {point['throughput']:.3g} /с")
+            if point["peak_rss_bytes"] > max(old["peak_rss_bytes"], 1 << 20) * (1 + threshold):
+                regressions.append(f"{case} N={point['n']}: пиковая память "
+                                   f"{old['peak_rss_bytes'] / 2 ** 20:.1f} -> {point['peak_rss_bytes'] / 2 ** 20:.1f} МБ")
+    old_startup = baseline.get("startup", {}).get("calculations_seconds")
+    new_startup = current["startup"]["calculations_seconds"]
+    if old_startup and new_startup > max(old_startup, 0.005) * (1 + threshold):
+        regressions.append(f"импорт calculations: {old_startup * 1e3:.1f} -> {new_startup * 1e3:.1f} мс")
+    return regressions
+
+
+def latest_result(exclude):
+    """Последний по времени файл результатов, кроме exclude"""
+    paths = [path for path in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if path != exclude]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=sorted(SIZES), default=sorted(SIZES))
+    parser.add_argument("--full", action="store_true", help="включить N = 10^7 для цепочки и разверток")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.1, help="допустимое ухудшение (доля)")
+    parser.add_argument("--baseline", help="файл результатов для сравнения")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--n", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.n, args.repeat)))
+        return 0
+
+    sizes = FULL_SIZES if args.full else SIZES
+    result = {
+        "commit": commit_id(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "cases": {},
+    }
+    for case in args.cases:
+        result["cases"][case] = []
+        for n in sizes[case]:
+            run = subprocess.run([sys.executable, __file__, "--case", case, "--n", str(n),
+                                  "--repeat", str(args.repeat)], capture_output=True, text=True, check=True)
+            point = json.loads(run.stdout.splitlines()[-1])
+            result["cases"][case].append(point)
+            print(f"{case:>8} N={n:>9}: {point['seconds']:.4f} с, {point['throughput']:.3g} /с, "
+                  f"пиковая память +{point['peak_rss_bytes'] / 2 ** 20:.1f} МБ")
+    result["startup"] = measure_startup()
+    print(f"Импорт calculations: {result['startup']['calculations_seconds'] * 1e3:.1f} мс")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    baseline_path = args.baseline or latest_result(exclude=path)
+    baseline = None
+    if baseline_path is not None:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"Результаты: {path}")
+
+    if baseline is None:
+        return 0
+    regressions = find_regressions(result, baseline, args.threshold)
+    print(f"Сравнение с {baseline.get('commit', baseline_path)}: "
+          f"{'регрессий нет' if not regressions else 'РЕГРЕССИИ:'}")
+    for line in regressions:
+        print(f"  {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
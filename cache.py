@@ -0,0 +1,168 @@
+"""
+Дисковый кэш результатов compute_plasma_state с адресацией по содержимому.
+
+Ключ — хэш входных массивов, физических констант calculations.py и исходного кода модуля,
+поэтому изменение данных, констант или формул автоматически дает промах. Каждая запись —
+каталог с файлами <величина>.npy; при попадании массивы отображаются в память (mmap)
+без чтения с диска целиком. При превышении лимита размера удаляются записи, к которым
+дольше всего не обращались (LRU).
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+import calculations
+from calculations import QUANTITIES, _as_columns, compute_plasma_state
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".plasma_cache")
+
+
+def _code_version():
+    """Хэш исходного кода calculations.py"""
+    with open(calculations.__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _constants():
+    """Числовые константы модуля calculations (скаляры) в детерминированном виде"""
+    return sorted((name, repr(value)) for name, value in vars(calculations).items()
+                  if not name.startswith("_") and isinstance(value, (int, float)) and not isinstance(value, bool))
+
+
+def cache_key(inputs, outputs):
+    """Ключ записи: хэш входов, набора величин, констант и версии кода"""
+    columns = _as_columns(inputs)
+    digest = hashlib.sha256()
+    digest.update(_code_version().encode())
+    digest.update(repr(_constants()).encode())
+    digest.update(repr(sorted(outputs)).encode())
+    for name in sorted(columns):
+        value = np.ascontiguousarray(columns[name])
+        digest.update(f"{name}|{value.dtype.str}|{value.shape}|".encode())
+        digest.update(value.tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Кэш в каталоге directory с ограничением суммарного размера max_bytes"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def load(self, key):
+        """Результаты записи key (массивы только для чтения через mmap) или None"""
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            result = {name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r")
+                      for name in meta["outputs"]}
+        except (OSError, ValueError, KeyError):
+            return None
+        # время доступа для LRU храним во времени изменения каталога записи
+        now = time.time()
+        os.utime(entry, (now, now))
+        return result
+
+    def store(self, key, result):
+        """Записывает результаты атомарно (через временный каталог) и освобождает место по LRU"""
+        temporary = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(temporary)
+        size = 0
+        for name, value in result.items():
+            path = os.path.join(temporary, f"{name}.npy")
+            np.save(path, np.asarray(value))
+            size += os.path.getsize(path)
+        with open(os.path.join(temporary, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"outputs": list(result), "bytes": size}, f)
+        try:
+            os.rename(temporary, self._entry(key))
+        except OSError:
+            # запись с тем же ключом уже создана другим процессом
+            shutil.rmtree(temporary, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """Список (время доступа, размер, путь) всех записей кэша"""
+        entries = []
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            try:
+                with open(os.path.join(entry, "meta.json"), encoding="utf-8") as f:
+                    size = json.load(f)["bytes"]
+                entries.append((os.path.getmtime(entry), size, entry))
+            except (OSError, ValueError, KeyError):
+                continue
+        return entries
+
+    def evict(self):
+        """Удаляет самые давно использованные записи, пока размер кэша превышает max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def compute(self, inputs, outputs=None):
+        """compute_plasma_state через кэш"""
+        if outputs is None:
+            outputs = list(QUANTITIES)
+        key = cache_key(inputs, outputs)
+        result = self.load(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute_plasma_state(inputs, outputs)
+        self.store(key, result)
+        return result
+
+    def stats(self):
+        """Счетчики попаданий и промахов и текущий размер кэша"""
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
+
+
+_default_cache = None
+
+
+def cached_plasma_state(inputs, outputs=None, cache=None):
+    """compute_plasma_state с кэшированием в общем кэше по умолчанию (или в cache)"""
+    global _default_cache
+    if cache is None:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        cache = _default_cache
+    return cache.compute(inputs, outputs)
+
+
+if __name__ == "__main__":
+    cache = ResultCache()
+    n = 10 ** 6
+    inputs = {name: np.resize(value, n) for name, value in calculations.MEASUREMENT_INPUTS.items()}
+    for attempt in range(2):
+        started = time.perf_counter()
+        cache.compute(inputs)
+        print(f"Расчет {attempt + 1}: {time.perf_counter() - started:.3f} с")
+    print(cache.stats())
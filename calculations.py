@@ -1,6 +1,9 @@
-import numpy as np
 import math
 
+import numpy as np
+
+import profiling
+
 # Физические константы
 k = 1.38e-23
 electron_mass = 9.11e-31
@@ -16,12 +19,15 @@ distances = np.array([10, 20, 30])
 plasm_potential = np.array([199.3, 186.1, 75.5])
 magnet_field = np.array([4.59, 29.2, 117.2])
 
-electron_current = np.array([2.59, 2.23, 0.5])
-ion_current = np.array([0.108, 0.475, 2.19])
+# Измеренные токи (А); electron_current и ion_current модуля — плотности токов (А/м²)
+measured_electron_current = np.array([2.59, 2.23, 0.5])
+measured_ion_current = np.array([0.108, 0.475, 2.19])
 electron_temperature = np.array([4, 7.01, 2.47])
 elastic_en_time = np.array([0.764e-7, 0.506e-7, 1.84e-7])
 nonelastic_en_time =  np.array([7.23e-6,  1.44e-6, 2.44e-6])
 neutral_temperature = 400
+# Концентрация нейтралов (м⁻³)
+neutral_concentration = np.array([3.62e19, 3.03e19, 2.84e18])
 kinetic_diameter_krypton = 360e-12
 
 # Расход криптона в м³/с (объемный расход)
@@ -33,110 +39,526 @@ krypton_density = 3.749  # кг/м³ при 0°C и 1 атм
 # Преобразование объемного расхода в массовый расход
 mass_flow = volume_flow * krypton_density  # кг/с
 
-print(f"Объемный расход криптона: {volume_flow:.6e} м³/с")
-print(f"Плотность криптона: {krypton_density} кг/м³")
-print(f"Массовый расход: {mass_flow:.6e} кг/с")
 krypton_mass = 83.798 * 1.66e-27
 
-magnet_field_tesla = magnet_field / 10000
-
 # Параметры канала
 mean_diameter = 56e-3
 large_diameter = 70
 channel_width = 28e-3
 square_of_channel = ((np.pi * (mean_diameter + channel_width) ** 2) / 4) - ((np.pi * (mean_diameter - channel_width) ** 2) / 4)
-neutral_mass_flow = mass_flow - ion_current * krypton_mass / elementary_charge  # кг/с
 
-electron_current = np.array([2.59, 2.23, 0.5]) / square_of_channel
-print(electron_current)
-ion_current = np.array([0.108, 0.475, 2.19]) / square_of_channel
-print(square_of_channel)
-print(f'Ионный ток: {ion_current}')
-print(elastic_en_time+nonelastic_en_time)
+# Входные столбцы движка: по одному значению на точку измерения
+INPUT_COLUMNS = (
+    "plasm_potential",
+    "magnet_field",
+    "electron_current",
+    "ion_current",
+    "electron_temperature",
+    "elastic_en_time",
+    "nonelastic_en_time",
+    "neutral_concentration",
+)
+
+# Свойства рабочего газа — входы графа (по умолчанию криптон, другие газы — species.py)
+SPECIES_INPUTS = ("atom_mass", "atom_radius", "ionisation_potential", "kinetic_diameter", "gas_density")
+
+# Необязательные входы со значениями по умолчанию
+INPUT_DEFAULTS = {
+    "neutral_temperature": neutral_temperature,
+    "volume_flow": volume_flow,
+    "atom_mass": krypton_mass,
+    "atom_radius": krypton_atom_radius,
+    "ionisation_potential": krypton_ionisation_potential,
+    "kinetic_diameter": kinetic_diameter_krypton,
+    "gas_density": krypton_density,
+}
+
+# Граф производных величин: имя -> (функция, имена величин-аргументов)
+QUANTITIES = {}
+
+# Величины, которые при пониженной точности считаются в float64 (погрешность float32 для них
+# больше 1e-6, см. precision.py): вычитание близких чисел 200 - U_пл и расход нейтралов,
+# произведение ε0·m_e ≈ 8e-42 вне нормального диапазона float32. Квадрат заряда e² ≈ 2.6e-38
+# и кулоновский логарифм ln(λ_D/b_min) в float32 теряют не больше 4e-7 и считаются как все.
+FLOAT64_QUANTITIES = {"mass_flow", "neutral_mass_flow", "ion_velocity", "plasm_frequency"}
+
+
+def quantity(name):
+    """Регистрирует функцию расчета величины name; зависимости берутся из имен ее аргументов"""
+    def register(func):
+        code = func.__code__
+        QUANTITIES[name] = (func, code.co_varnames[:code.co_argcount])
+        return func
+    return register
+
+
+def _as_columns(inputs, dtype=np.float64):
+    """
+    Приводит входные данные (словарь столбцов или структурированный массив) к словарю массивов
+    с типом не ниже dtype (столбцы float32 при dtype=np.float32 не копируются)
+    """
+    if isinstance(inputs, np.ndarray) and inputs.dtype.names:
+        inputs = {name: inputs[name] for name in inputs.dtype.names}
+    columns = {name: np.asarray(value, dtype=np.float64) for name, value in INPUT_DEFAULTS.items()}
+    for name, value in inputs.items():
+        value = np.asarray(value)
+        columns[name] = value.astype(np.result_type(value, dtype), copy=False)
+    return columns
+
+
+def evaluation_order(outputs, available=()):
+    """Топологический порядок узлов графа, нужных для величин outputs (каждый узел один раз)"""
+    order = []
+    state = {}
+
+    def visit(name):
+        if name in available or state.get(name) == "done":
+            return
+        if name not in QUANTITIES:
+            raise ValueError(f"Не задан входной столбец: {name}")
+        if state.get(name) == "visiting":
+            raise ValueError(f"Циклическая зависимость в графе величин: {name}")
+        state[name] = "visiting"
+        for dependency in QUANTITIES[name][1]:
+            visit(dependency)
+        state[name] = "done"
+        order.append(name)
+
+    for name in outputs:
+        visit(name)
+    return order
+
+
+def compute_plasma_state(inputs, outputs=None, dtype=np.float64):
+    """
+    Векторный расчет параметров плазмы для N точек измерений за один проход.
+
+    inputs — словарь столбцов NumPy (или структурированный массив) с полями INPUT_COLUMNS;
+    токи задаются в амперах, магнитное поле в гауссах. Необязательные поля
+    neutral_temperature и volume_flow могут быть скалярами. Столбец с именем
+    производной величины заменяет ее расчет.
+    outputs — имена нужных величин; вычисляются только узлы графа, от которых они
+    зависят, промежуточные массивы освобождаются сразу после последнего использования.
+    По умолчанию считаются все величины из QUANTITIES.
+    dtype — тип производных величин: np.float32 вдвое сокращает память и трафик,
+    чувствительные к округлению величины (FLOAT64_QUANTITIES) при этом считаются в float64,
+    входные столбцы остаются float64, результаты возвращаются в dtype. Погрешность относительно float64 — precision.py.
+    Возвращает словарь массивов длины N с именами как у переменных модуля.
+    """
+    values = _as_columns(inputs, dtype)
+    if outputs is None:
+        outputs = list(QUANTITIES)
+    return evaluate(values, outputs, dtype)
+
+
+def evaluate(values, outputs, dtype=None):
+    """
+    Вычисляет величины outputs по графу из уже подготовленных входных значений values.
+
+    Значения могут быть любыми объектами с арифметикой NumPy (массивы, дуальные числа и т. п.);
+    словарь values используется как рабочий и изменяется.
+    dtype — тип хранения величин (None — без приведения). При пониженной точности
+    (например, np.float32) входы и результаты узлов приводятся к dtype, а величины из
+    FLOAT64_QUANTITIES считаются в float64 по исходным входам и по float64-результатам
+    других таких величин.
+    """
+    reduced = dtype is not None and np.dtype(dtype) != np.float64
+    order = evaluation_order(outputs, values)
+
+    # сколько еще узлов прочитают каждую величину
+    remaining = {}
+    for name in order:
+        for dependency in QUANTITIES[name][1]:
+            remaining[dependency] = remaining.get(dependency, 0) + 1
+
+    keep = set(outputs)
+    # значения float64 для аргументов узлов из FLOAT64_QUANTITIES
+    precise = {}
+    if reduced:
+        arguments = {dependency for name in order if name in FLOAT64_QUANTITIES
+                     for dependency in QUANTITIES[name][1]}
+        for name in list(values):
+            if name in arguments:
+                precise[name] = values[name]
+
+    profiler = profiling.active()
+    for name in order:
+        func, dependencies = QUANTITIES[name]
+        if reduced and name in FLOAT64_QUANTITIES:
+            args = [np.asarray(precise.get(dependency, values[dependency]), dtype=np.float64)
+                    for dependency in dependencies]
+        else:
+            args = [values[dependency] for dependency in dependencies]
+            if reduced:
+                # входы приводятся к dtype при первом чтении
+                for i, dependency in enumerate(dependencies):
+                    if getattr(args[i], "dtype", dtype) != dtype:
+                        args[i] = values[dependency] = np.asarray(args[i], dtype=dtype)
+        if profiler is None:
+            result = func(*args)
+        else:
+            with profiler.stage(name, STAGE_OF.get(name, "")) as record:
+                result = func(*args)
+                record.elements = profiling.element_count(result)
+        # аргументы не должны удерживать освобождаемые ниже массивы
+        del args
+        if reduced:
+            if name in FLOAT64_QUANTITIES and name in arguments:
+                precise[name] = result
+            result = np.asarray(result, dtype=dtype)
+        values[name] = result
+        for dependency in dependencies:
+            remaining[dependency] -= 1
+            if not remaining[dependency] and dependency not in keep:
+                del values[dependency]
+                precise.pop(dependency, None)
+    return {name: values[name] for name in outputs}
+
+
+@quantity("magnet_field_tesla")
+def _magnet_field_tesla(magnet_field):
+    return magnet_field / 10000
+
+
+@quantity("mass_flow")
+def _mass_flow(volume_flow, gas_density):
+    return volume_flow * gas_density  # кг/с
+
+
+@quantity("neutral_mass_flow")
+def _neutral_mass_flow(mass_flow, ion_current, atom_mass):
+    return mass_flow - ion_current * atom_mass / elementary_charge  # кг/с
+
+
+# Плотности токов (А/м²)
+@quantity("electron_current_density")
+def _electron_current_density(electron_current):
+    return electron_current / square_of_channel
+
+
+@quantity("ion_current_density")
+def _ion_current_density(ion_current):
+    return ion_current / square_of_channel
+
 
 # Скорости частиц (м/с)
-electron_velocity = ((8*k*electron_temperature*11600)/(np.pi*electron_mass)) ** 0.5
-ion_velocity = ((elementary_charge*(200 - plasm_potential))/(2*krypton_mass)) ** 0.5
-neutral_velocity = (3*k*neutral_temperature/krypton_mass) ** 0.5
+@quantity("electron_velocity")
+def _electron_velocity(electron_temperature):
+    return ((8*k*electron_temperature*11600)/(np.pi*electron_mass)) ** 0.5
+
+
+@quantity("ion_velocity")
+def _ion_velocity(plasm_potential, atom_mass):
+    return ((elementary_charge*(200 - plasm_potential))/(2*atom_mass)) ** 0.5
+
+
+@quantity("neutral_velocity")
+def _neutral_velocity(neutral_temperature, atom_mass):
+    return (3*k*neutral_temperature/atom_mass) ** 0.5
+
 
 # Температура ионов
-ion_temperature = (krypton_mass * ion_velocity ** 2 / (2 * k)) / 11600
+@quantity("ion_temperature")
+def _ion_temperature(ion_velocity, atom_mass):
+    return (atom_mass * ion_velocity ** 2 / (2 * k)) / 11600
+
+
+# Концентрации частиц (м⁻³)
+@quantity("ion_concentration")
+def _ion_concentration(ion_current_density, ion_velocity):
+    return ion_current_density/(ion_velocity*elementary_charge)
+
+
+@quantity("electron_concentration")
+def _electron_concentration(ion_concentration):
+    return ion_concentration
 
-# Концентрации частиц
-ion_concentration = ion_current/(ion_velocity*elementary_charge)  # м⁻³
-electron_concentration = ion_concentration
 
-# Концентрация нейтралов: массовый расход нейтралов / (масса частицы * скорость * площадь)
-neutral_concentration = np.array([3.62e19, 3.03e19, 2.84e18])
 # Параметры плазмы
-debye_radius = ((dielectric_constant * k * electron_temperature * 11600) / (electron_concentration * (elementary_charge ** 2))) ** 0.5  # м
-number_of_particles_in_debye_sphere = (electron_concentration) * (debye_radius ** 3) * np.pi * (4 / 3)  # безразмерная
-plasm_frequency = ((electron_concentration * elementary_charge ** 2) / (dielectric_constant * electron_mass)) ** 0.5  # рад/с
-                   
+@quantity("debye_radius")
+def _debye_radius(electron_temperature, electron_concentration):
+    return ((dielectric_constant * k * electron_temperature * 11600) / (electron_concentration * (elementary_charge ** 2))) ** 0.5  # м
+
+
+@quantity("number_of_particles_in_debye_sphere")
+def _number_of_particles_in_debye_sphere(electron_concentration, debye_radius):
+    return (electron_concentration) * (debye_radius ** 3) * np.pi * (4 / 3)  # безразмерная
+
+
+@quantity("plasm_frequency")
+def _plasm_frequency(electron_concentration):
+    return ((electron_concentration * elementary_charge ** 2) / (dielectric_constant * electron_mass)) ** 0.5  # рад/с
+
+
 # Кулоновский логарифм для электронов (и электрон-ионных): ln(λ_D/b_min)
-b_min = (elementary_charge ** 2)/(4*np.pi*dielectric_constant*electron_temperature * elementary_charge)
-electron_qoulon_logarithm = np.log(debye_radius/b_min)
+@quantity("b_min")
+def _b_min(electron_temperature):
+    return (elementary_charge ** 2)/(4*np.pi*dielectric_constant*electron_temperature * elementary_charge)
+
+
+@quantity("electron_qoulon_logarithm")
+def _electron_qoulon_logarithm(debye_radius, b_min):
+    return np.log(debye_radius/b_min)
+
 
 # циклотронные частоты (рад/с)
-electron_cycle_frequency = (elementary_charge * magnet_field_tesla) / electron_mass     # ω_ce
-ion_cycle_frequency = (elementary_charge * magnet_field_tesla) / krypton_mass           # ω_ci
+@quantity("electron_cycle_frequency")
+def _electron_cycle_frequency(magnet_field_tesla):
+    return (elementary_charge * magnet_field_tesla) / electron_mass     # ω_ce
+
+
+@quantity("ion_cycle_frequency")
+def _ion_cycle_frequency(magnet_field_tesla, atom_mass):
+    return (elementary_charge * magnet_field_tesla) / atom_mass      # ω_ci
+
+
+# поперечная компонента тепловой скорости v_perp = v_th / sqrt(2) для изотропного распределения
+@quantity("v_perp_e")
+def _v_perp_e(electron_velocity):
+    return electron_velocity / np.sqrt(2)
+
+
+@quantity("v_perp_i")
+def _v_perp_i(ion_velocity):
+    return ion_velocity / np.sqrt(2)
 
-# используем тепловые скорости, которые вы уже вычислили:
-# electron_velocity и ion_velocity у вас — это средняя/thermal speeds
-# принять поперечную компоненту v_perp = v_th / sqrt(2) для изотропного распределения
-v_perp_e = electron_velocity / np.sqrt(2)
-v_perp_i = ion_velocity / np.sqrt(2)
 
 # Larmor radii (м)
-electron_larmor_radius = (electron_mass * v_perp_e) / (elementary_charge * magnet_field_tesla)
-ion_larmor_radius = (krypton_mass * v_perp_i) / (elementary_charge * magnet_field_tesla)
+@quantity("electron_larmor_radius")
+def _electron_larmor_radius(v_perp_e, magnet_field_tesla):
+    return (electron_mass * v_perp_e) / (elementary_charge * magnet_field_tesla)
+
+
+@quantity("ion_larmor_radius")
+def _ion_larmor_radius(v_perp_i, magnet_field_tesla, atom_mass):
+    return (atom_mass * v_perp_i) / (elementary_charge * magnet_field_tesla)
+
 
 # Поляризуемость атома (из формулы r_at=0.62(alpha)*1/3)
-alpha = (krypton_atom_radius/0.62) ** 3  # м³
+@quantity("alpha")
+def _alpha(atom_radius):
+    return (atom_radius/0.62) ** 3  # м³
+
+
 # Вычисление относительной энергии движения иона и атома
-relative_energy = ((krypton_mass * (ion_velocity - neutral_velocity) ** 2) / 2) * 6.24e18  # эВ
-print(f"rel:{relative_energy}")
+@quantity("relative_energy")
+def _relative_energy(ion_velocity, neutral_velocity, atom_mass):
+    return ((atom_mass * (ion_velocity - neutral_velocity) ** 2) / 2) * 6.24e18  # эВ
+
 
 # Сечения столкновений (м²)
-neutral_neutral_collision_cross_section = np.pi*kinetic_diameter_krypton**2
-qoulon_collision_cross_section_electron = 2.87e-18 * electron_qoulon_logarithm / ((electron_temperature) ** 2)
-transport_cross_section_ions = 2 * np.pi * (2 ** 0.5) * (a0 ** 2) * ((alpha / (a0 ** 3)) * (krypton_ionisation_potential/relative_energy)) ** 0.5
-recharge_cross_section = transport_cross_section_ions / 2
+@quantity("neutral_neutral_collision_cross_section")
+def _neutral_neutral_collision_cross_section(kinetic_diameter):
+    return np.pi*kinetic_diameter**2
+
+
+@quantity("qoulon_collision_cross_section_electron")
+def _qoulon_collision_cross_section_electron(electron_qoulon_logarithm, electron_temperature):
+    return 2.87e-18 * electron_qoulon_logarithm / ((electron_temperature) ** 2)
+
+
+@quantity("transport_cross_section_ions")
+def _transport_cross_section_ions(alpha, relative_energy, ionisation_potential):
+    return 2 * np.pi * (2 ** 0.5) * (a0 ** 2) * ((alpha / (a0 ** 3)) * (ionisation_potential/relative_energy)) ** 0.5
+
+
+@quantity("recharge_cross_section")
+def _recharge_cross_section(transport_cross_section_ions):
+    return transport_cross_section_ions / 2
+
 
 # Частоты столкновений для электронов (с⁻¹)
-electron_electron_collision_frequency = (2) ** 0.5 * (qoulon_collision_cross_section_electron * electron_concentration * electron_velocity)
-electron_ion_collision_frequency = (qoulon_collision_cross_section_electron * ion_concentration * electron_velocity)
-electron_neutral_collision_frequency = (1 / elastic_en_time) + (1 /nonelastic_en_time)
+@quantity("electron_electron_collision_frequency")
+def _electron_electron_collision_frequency(qoulon_collision_cross_section_electron, electron_concentration, electron_velocity):
+    return (2) ** 0.5 * (qoulon_collision_cross_section_electron * electron_concentration * electron_velocity)
+
+
+@quantity("electron_ion_collision_frequency")
+def _electron_ion_collision_frequency(qoulon_collision_cross_section_electron, ion_concentration, electron_velocity):
+    return (qoulon_collision_cross_section_electron * ion_concentration * electron_velocity)
+
+
+@quantity("electron_neutral_collision_frequency")
+def _electron_neutral_collision_frequency(elastic_en_time, nonelastic_en_time):
+    return (1 / elastic_en_time) + (1 /nonelastic_en_time)
+
+
+@quantity("overall_electron_collision_frequency")
+def _overall_electron_collision_frequency(electron_electron_collision_frequency, electron_ion_collision_frequency,
+                                          electron_neutral_collision_frequency):
+    return electron_electron_collision_frequency + electron_ion_collision_frequency + electron_neutral_collision_frequency
 
-overall_electron_collision_frequency = electron_electron_collision_frequency + electron_ion_collision_frequency + electron_neutral_collision_frequency
 
 # Частоты столкновений для ионов (с⁻¹)
-ion_ion_collision_frequency = (2) ** 0.5 * (qoulon_collision_cross_section_electron * ion_concentration * ion_velocity)
-ion_neutral_collision_frequency = 3/2 * ((ion_velocity - neutral_velocity) * neutral_concentration * recharge_cross_section)
-overall_ion_collision_frequency = ion_ion_collision_frequency + ion_neutral_collision_frequency + electron_ion_collision_frequency
+@quantity("ion_ion_collision_frequency")
+def _ion_ion_collision_frequency(qoulon_collision_cross_section_electron, ion_concentration, ion_velocity):
+    return (2) ** 0.5 * (qoulon_collision_cross_section_electron * ion_concentration * ion_velocity)
+
+
+@quantity("ion_neutral_collision_frequency")
+def _ion_neutral_collision_frequency(ion_velocity, neutral_velocity, neutral_concentration, recharge_cross_section):
+    return 3/2 * ((ion_velocity - neutral_velocity) * neutral_concentration * recharge_cross_section)
+
+
+@quantity("overall_ion_collision_frequency")
+def _overall_ion_collision_frequency(ion_ion_collision_frequency, ion_neutral_collision_frequency,
+                                     electron_ion_collision_frequency):
+    return ion_ion_collision_frequency + ion_neutral_collision_frequency + electron_ion_collision_frequency
+
 
 # Частоты столкновений для нейтральных частиц (с⁻¹)
-neutral_neutral_collision_frequency = neutral_concentration * neutral_velocity * neutral_neutral_collision_cross_section
+@quantity("neutral_neutral_collision_frequency")
+def _neutral_neutral_collision_frequency(neutral_concentration, neutral_velocity, neutral_neutral_collision_cross_section):
+    return neutral_concentration * neutral_velocity * neutral_neutral_collision_cross_section
+
+
+@quantity("overall_neutral_collision_frequency")
+def _overall_neutral_collision_frequency(electron_neutral_collision_frequency, ion_neutral_collision_frequency,
+                                         neutral_neutral_collision_frequency):
+    return electron_neutral_collision_frequency + ion_neutral_collision_frequency + neutral_neutral_collision_frequency
+
 
-overall_neutral_collision_frequency = electron_neutral_collision_frequency +  + ion_neutral_collision_frequency + neutral_neutral_collision_frequency
 # Длины свободного пробега (м)
-electron_free_path = electron_velocity / overall_electron_collision_frequency
-ion_free_path = ion_velocity / overall_ion_collision_frequency
-neutral_free_path = neutral_velocity / overall_neutral_collision_frequency
+@quantity("electron_free_path")
+def _electron_free_path(electron_velocity, overall_electron_collision_frequency):
+    return electron_velocity / overall_electron_collision_frequency
+
+
+@quantity("ion_free_path")
+def _ion_free_path(ion_velocity, overall_ion_collision_frequency):
+    return ion_velocity / overall_ion_collision_frequency
+
+
+@quantity("neutral_free_path")
+def _neutral_free_path(neutral_velocity, overall_neutral_collision_frequency):
+    return neutral_velocity / overall_neutral_collision_frequency
+
 
 # Параметры Холла (безразмерные)
 # β = ωc / ν, где ωc - циклотронная частота, ν - частота столкновений
-# Параметр Холла показывает отношение времени между столкновениями к периоду циклотронного вращения
-electron_hall_parameter = electron_cycle_frequency / (overall_electron_collision_frequency)
-ion_hall_parameter = ion_cycle_frequency / overall_ion_collision_frequency
+@quantity("electron_hall_parameter")
+def _electron_hall_parameter(electron_cycle_frequency, overall_electron_collision_frequency):
+    return electron_cycle_frequency / (overall_electron_collision_frequency)
+
+
+@quantity("ion_hall_parameter")
+def _ion_hall_parameter(ion_cycle_frequency, overall_ion_collision_frequency):
+    return ion_cycle_frequency / overall_ion_collision_frequency
+
 
 # Электропроводность (См/м)
-electric_conductivity_longitudal = (electron_concentration * elementary_charge ** 2) / (electron_mass * (electron_neutral_collision_frequency + electron_ion_collision_frequency))
-electric_conductivity_transversal = electric_conductivity_longitudal * (electron_hall_parameter / (electron_hall_parameter ** 2 + 1))
+@quantity("electric_conductivity_longitudal")
+def _electric_conductivity_longitudal(electron_concentration, electron_neutral_collision_frequency,
+                                      electron_ion_collision_frequency):
+    return (electron_concentration * elementary_charge ** 2) / (electron_mass * (electron_neutral_collision_frequency + electron_ion_collision_frequency))
+
+
+@quantity("electric_conductivity_transversal")
+def _electric_conductivity_transversal(electric_conductivity_longitudal, electron_hall_parameter):
+    return electric_conductivity_longitudal * (electron_hall_parameter / (electron_hall_parameter ** 2 + 1))
+
+
+# Тяга и тяговый КПД (по току ионов в каждой точке)
+@quantity("thrust")
+def _thrust(ion_current_density, atom_mass):
+    return (ion_current_density * square_of_channel) * (2 * atom_mass * 200 / elementary_charge) ** (1/2)
+
+
+@quantity("nu_thrust")
+def _nu_thrust(thrust, ion_velocity):
+    return thrust * ion_velocity / (540)
+
+
+# Этапы цепочки для профилирования (profiling.py): этап -> величины
+STAGES = {
+    "inputs": ("magnet_field_tesla", "mass_flow", "neutral_mass_flow",
+               "electron_current_density", "ion_current_density"),
+    "velocities": ("electron_velocity", "ion_velocity", "neutral_velocity", "ion_temperature",
+                   "v_perp_e", "v_perp_i"),
+    "concentrations": ("ion_concentration", "electron_concentration"),
+    "plasma_parameters": ("debye_radius", "number_of_particles_in_debye_sphere", "plasm_frequency",
+                          "electron_cycle_frequency", "ion_cycle_frequency",
+                          "electron_larmor_radius", "ion_larmor_radius"),
+    "coulomb_logarithm": ("b_min", "electron_qoulon_logarithm"),
+    "cross_sections": ("alpha", "relative_energy", "neutral_neutral_collision_cross_section",
+                       "qoulon_collision_cross_section_electron", "transport_cross_section_ions",
+                       "recharge_cross_section"),
+    "collision_frequencies": ("electron_electron_collision_frequency", "electron_ion_collision_frequency",
+                              "electron_neutral_collision_frequency", "overall_electron_collision_frequency",
+                              "ion_ion_collision_frequency", "ion_neutral_collision_frequency",
+                              "overall_ion_collision_frequency", "neutral_neutral_collision_frequency",
+                              "overall_neutral_collision_frequency"),
+    "transport": ("electron_free_path", "ion_free_path", "neutral_free_path",
+                  "electron_hall_parameter", "ion_hall_parameter",
+                  "electric_conductivity_longitudal", "electric_conductivity_transversal"),
+    "thrust": ("thrust", "nu_thrust"),
+}
+STAGE_OF = {name: stage for stage, names in STAGES.items() for name in names}
+
+
+# Входные данные точек измерений СПД
+MEASUREMENT_INPUTS = {
+    "plasm_potential": plasm_potential,
+    "magnet_field": magnet_field,
+    "electron_current": measured_electron_current,
+    "ion_current": measured_ion_current,
+    "electron_temperature": electron_temperature,
+    "elastic_en_time": elastic_en_time,
+    "nonelastic_en_time": nonelastic_en_time,
+    "neutral_concentration": neutral_concentration,
+}
+
+# Величины модуля, которые не совпадают по имени с узлами графа
+_MEASUREMENT_ALIASES = {
+    "electron_current": lambda state: state["electron_current_density"],
+    "ion_current": lambda state: state["ion_current_density"],
+    # Тяга и тяговый КПД для точки на срезе канала
+    "thrust": lambda state: state["thrust"][2],
+    "nu_thrust": lambda state: state["nu_thrust"][2],
+}
+
+_measurement_state = None
+
+
+def measurement_state():
+    """Результаты расчета для точек измерений СПД; считаются один раз, при первом обращении"""
+    global _measurement_state
+    if _measurement_state is None:
+        _measurement_state = compute_plasma_state(MEASUREMENT_INPUTS)
+    return _measurement_state
+
+
+def __getattr__(name):
+    # Результаты для точек измерений доступны как переменные модуля, но считаются лениво,
+    # чтобы импорт модуля был быстрым и ничего не печатал
+    if name in _MEASUREMENT_ALIASES:
+        return _MEASUREMENT_ALIASES[name](measurement_state())
+    if name in QUANTITIES:
+        return measurement_state()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [name for name in globals() if not name.startswith("_")]
+__all__ += [name for name in (*QUANTITIES, *_MEASUREMENT_ALIASES) if name not in __all__]
+
+
+def __dir__():
+    return __all__
+
+
+def print_summary():
+    """Печатает основные результаты расчета для точек измерений"""
+    print(f"Объемный расход криптона: {volume_flow:.6e} м³/с")
+    print(f"Плотность криптона: {krypton_density} кг/м³")
+    print(f"Массовый расход: {mass_flow:.6e} кг/с")
+    print(__getattr__("electron_current"))
+    print(square_of_channel)
+    print(f'Ионный ток: {__getattr__("ion_current")}')
+    print(elastic_en_time+nonelastic_en_time)
+    print(f"rel:{__getattr__('relative_energy')}")
+    print(__getattr__("thrust"))
+    print(__getattr__("nu_thrust"))
 
-# Тяга и тяговый КПД
-thrust = (ion_current[2] * square_of_channel) * (2 * krypton_mass * 200 / elementary_charge) ** (1/2)
-nu_thrust = thrust * ion_velocity[2] / (540)
 
-print(thrust)
-print(nu_thrust)
\ No newline at end of file
+if __name__ == "__main__":
+    print_summary()
@@ -0,0 +1,115 @@
+"""
+Равновесная степень покрытия вольфрама цезием для модели катода W-Cs (tgru.py).
+
+Покрытие θ находится из баланса адсорбции и десорбции
+
+    N_i·(1 - θ) = n0·θ·ν0·exp(-E_d(θ)/kT_k),
+
+где поток атомов N_i задается явно или по давлению насыщенных паров при T_Cs,
+а энергия десорбции линейно убывает с покрытием: E_d(θ) = E_d0 - (E_d0 - E_d1)·θ.
+В переменной u = ln(θ/(1 - θ)) уравнение принимает вид
+
+    g(u) = ln(N_i/(n0·ν0)) - u + E_d(θ(u))/kT_k = 0,
+
+функция g строго убывает, а корень лежит в конечном отрезке
+[ln(N_i/(n0·ν0)) + E_d1/kT, ln(N_i/(n0·ν0)) + E_d0/kT]. Все точки решаются одновременно
+методом Ньютона с защитой бисекцией внутри этого отрезка.
+"""
+import time
+
+import numpy as np
+from scipy import constants
+from scipy.special import expit
+
+from emission import A, calculate_Cs_pressure, emission_current_with_field, e, k, n0, phi_Cs, phi_W
+
+cs_mass = 132.905 * constants.atomic_mass  # Масса атома цезия, кг
+mmHg = 133.322  # 1 мм рт.ст. в Па
+
+# Параметры десорбции цезия с вольфрама
+nu0 = 1e13      # Частотный множитель десорбции, с^{-1}
+E_d0 = 2.8      # Энергия десорбции при θ -> 0, эВ
+E_d1 = 1.8      # Энергия десорбции при θ -> 1, эВ
+
+
+def cs_atom_flux(T_Cs):
+    """Поток атомов цезия на поверхность из насыщенного пара p/sqrt(2π m k T), см^{-2}·с^{-1}"""
+    p = calculate_Cs_pressure(T_Cs) * mmHg  # Па
+    return p / np.sqrt(2 * np.pi * cs_mass * k * T_Cs) * 1e-4
+
+
+def solve_coverage(T_k, T_Cs=None, N_i=None, E_k=0.0, E_d0=E_d0, E_d1=E_d1, nu0=nu0, n0=n0,
+                   phi_W=phi_W, phi_Cs=phi_Cs, A=A, xtol=1e-12, max_iter=60):
+    """
+    Равновесные θ, Δφ = θ·(φ_W - φ_Cs) и ток эмиссии для всех сочетаний (T_k, T_Cs или N_i, E_k).
+
+    Аргументы приводятся к общей форме по правилам broadcasting. Возвращает словарь
+    массивов этой формы: "theta", "delta_phi", "phi_eff", "j", "N_i", "converged"
+    (маска сходимости), "iterations" (число итераций каждой точки) и "residual"
+    (невязка g в найденной точке).
+    """
+    if N_i is None:
+        if T_Cs is None:
+            raise ValueError("Нужно задать поток атомов N_i или температуру паров T_Cs")
+        N_i = cs_atom_flux(T_Cs)
+    T_k, N_i, E_k = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (T_k, N_i, E_k)))
+
+    kT_eV = k * T_k / e
+    c = np.log(N_i / (n0 * nu0))
+    slope = (E_d0 - E_d1) / kT_eV
+
+    def residual(u):
+        theta = expit(u)
+        g = c - u + (E_d0 - (E_d0 - E_d1) * theta) / kT_eV
+        dg = -1 - slope * theta * (1 - theta)
+        return g, dg
+
+    low = c + E_d1 / kT_eV
+    high = c + E_d0 / kT_eV
+    u = (low + high) / 2
+    iterations = np.zeros(u.shape, dtype=np.int64)
+    converged = np.zeros(u.shape, dtype=bool)
+    g, dg = residual(u)
+
+    for _ in range(max_iter):
+        converged |= g == 0
+        active = ~converged
+        if not active.any():
+            break
+        # g убывает: при g > 0 корень правее u, иначе левее
+        low = np.where(active & (g > 0), u, low)
+        high = np.where(active & (g < 0), u, high)
+        newton = u - g / dg
+        inside = (newton >= low) & (newton <= high)
+        step = np.where(inside, newton, (low + high) / 2) - u
+        u = np.where(active, u + step, u)
+        iterations += active
+        converged |= active & ((np.abs(step) <= xtol * np.maximum(1, np.abs(u))) | (high - low <= xtol))
+        g, dg = residual(u)
+
+    theta = expit(u)
+    delta_phi = theta * (phi_W - phi_Cs)
+    j, phi_eff = emission_current_with_field(T_k, E_k, phi_W, delta_phi, A)
+    return {
+        "theta": theta,
+        "delta_phi": delta_phi,
+        "phi_eff": phi_eff,
+        "j": j,
+        "N_i": N_i,
+        "converged": converged,
+        "iterations": iterations,
+        "residual": g,
+    }
+
+
+if __name__ == "__main__":
+    from emission import mesh
+
+    T_k, T_Cs, E_k = mesh(np.linspace(800, 2000, 50), np.linspace(300, 500, 50), np.logspace(4, 7, 50))
+    started = time.perf_counter()
+    result = solve_coverage(T_k, T_Cs=T_Cs, E_k=E_k)
+    elapsed = time.perf_counter() - started
+    print(f"Точек: {result['theta'].size}, время {elapsed * 1000:.1f} мс")
+    print(f"Сошлось: {result['converged'].mean() * 100:.1f} %, итераций: "
+          f"среднее {result['iterations'].mean():.1f}, максимум {result['iterations'].max()}")
+    print(f"Максимальная невязка: {np.abs(result['residual']).max():.2e}")
@@ -0,0 +1,114 @@
+"""
+Прореживание плотных точечных рядов до разрешения экрана перед передачей в matplotlib.
+
+Все ряды на листах графиков рисуются маркерами без линий. В срезе развертки в одном
+пиксельном столбце много значений y, поэтому область построения делится на пиксельные
+ячейки по обеим осям, и в каждой занятой ячейке остается несколько первых точек
+(MARKERS_PER_CELL): маркеры смещаются меньше чем на пиксель, а число точек ограничено
+числом занятых ячеек.
+"""
+import numpy as np
+
+# Число точек, сохраняемых в пиксельной ячейке при прореживании маркеров: сглаженный край
+# маркера, нарисованного поверх себя несколько раз, темнее, чем у одиночного маркера,
+# поэтому одна точка на ячейку осветляет края плотных облаков точек
+MARKERS_PER_CELL = 5
+
+
+def pixel_columns(x, pixels, log=False):
+    """Номер пиксельного столбца для каждого значения x (x конечны, при log — положительны)"""
+    t = np.log10(x) if log else np.asarray(x, dtype=np.float64)
+    low, high = t.min(), t.max()
+    if high == low:
+        return np.zeros(len(t), dtype=np.int64)
+    columns = ((t - low) * (pixels / (high - low))).astype(np.int64)
+    np.clip(columns, 0, pixels - 1, out=columns)
+    return columns
+
+
+def marker_indices(x, y, width, height, xlog=False, ylog=False, per_cell=MARKERS_PER_CELL):
+    """
+    Индексы точек ряда (x, y), не больше per_cell на каждую занятую ячейку сетки
+    width × height (ячейки делят диапазон данных по каждой оси). Нечисловые точки (и
+    неположительные на логарифмической оси) отбрасываются. Индексы — в исходном порядке.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if xlog:
+        valid &= x > 0
+    if ylog:
+        valid &= y > 0
+    index = np.flatnonzero(valid)
+    if len(index) == 0:
+        return index
+    cells = pixel_columns(x[index], width, xlog) * height + pixel_columns(y[index], height, ylog)
+    order = np.argsort(cells, kind="stable")
+    cells = cells[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(cells)) + 1))
+    # номер точки внутри своей ячейки
+    rank = np.arange(len(cells)) - np.repeat(starts, np.diff(np.append(starts, len(cells))))
+    return index[np.sort(order[rank < per_cell])]
+
+
+def panel_size(ax, dpi):
+    """Ширина и высота области построения ax в пикселях при сохранении с разрешением dpi"""
+    extent = ax.get_window_extent()
+    scale = dpi / ax.figure.dpi
+    return max(1, int(np.ceil(extent.width * scale))), max(1, int(np.ceil(extent.height * scale)))
+
+
+def decimate_markers(x, y, width, height, xlog=False, ylog=False, per_cell=MARKERS_PER_CELL):
+    """
+    Точечный ряд (x, y), прореженный до per_cell точек на пиксельную ячейку панели
+    width × height. Если прореживание ничего не убирает (в каждой занятой ячейке не
+    больше per_cell точек), ряд возвращается без изменений.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if y.size <= per_cell:
+        return x, y
+    x, y = np.broadcast_arrays(x, y)
+    keep = marker_indices(x, y, width, height, xlog, ylog, per_cell)
+    if len(keep) == y.size:
+        return x, y
+    return x[keep], y[keep]
+
+
+if __name__ == "__main__":
+    import io
+    import time
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    rng = np.random.default_rng(0)
+
+    def render(x, y, dpi, reduce):
+        fig, ax = plt.subplots(figsize=(7, 5), dpi=dpi)
+        ax.set_yscale("log")
+        xs, ys = x, y
+        if reduce:
+            xs, ys = decimate_markers(x, y, *panel_size(ax, dpi), ylog=True)
+        ax.plot(xs, ys, 'r', marker='o', linestyle='none')
+        fig.savefig(io.BytesIO(), dpi=dpi, format="png")
+        image = np.asarray(fig.canvas.buffer_rgba()).copy()
+        plt.close(fig)
+        return image, len(xs)
+
+    # срез развертки маркерами: 50 значений x, в каждом много значений y
+    for n in (10 ** 5, 10 ** 6):
+        x = np.repeat(np.linspace(5, 200, 50), n // 50)
+        y = np.exp(rng.uniform(np.log(1e-3), np.log(1e3), n))
+        for dpi in (100, 300):
+            started = time.perf_counter()
+            full, _ = render(x, y, dpi, False)
+            full_time = time.perf_counter() - started
+            started = time.perf_counter()
+            reduced, points = render(x, y, dpi, True)
+            reduced_time = time.perf_counter() - started
+            difference = np.abs(full.astype(np.int16) - reduced).max(axis=-1)
+            print(f"{n} точек, {dpi} dpi: осталось {points}, полный ряд {full_time:.2f} с, "
+                  f"прореженный {reduced_time:.2f} с; отличающихся пикселей {np.mean(difference > 0) * 100:.3f} %, "
+                  f"заметно (больше 10 % яркости) {np.mean(difference > 25) * 100:.3f} %")
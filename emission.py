@@ -0,0 +1,118 @@
+"""
+Векторизованные формулы эмиссии катода W-Cs (модель из tgru.py).
+
+Все функции принимают массивы любых согласованных форм и считаются за один проход NumPy,
+поэтому двумерные и трехмерные карты (T, E, Δφ) строятся без циклов по точкам:
+оси задаются открытой сеткой mesh(T, E, ...) и перемножаются по правилам broadcasting.
+"""
+import time
+
+import numpy as np
+from scipy import constants
+
+# Константы
+e = constants.e  # Заряд электрона, Кл
+k = constants.k  # Постоянная Больцмана, Дж/К
+
+# Параметры материалов
+A = 60          # Постоянная Ричардсона, А/(см²·К²)
+phi_W = 4.52    # Работа выхода вольфрама, эВ
+phi_Cs = 1.69   # Работа выхода цезия, эВ
+n0 = 1e15       # Плотность атомов в монослое, см^{-2}
+
+# Снижение барьера за счет поля (эффект Шоттки): 3.62e-4·sqrt(E) эВ, E в В/см
+SCHOTTKY_COEFFICIENT = 3.62e-4
+
+
+def mesh(*axes):
+    """Открытая сетка осей: каждая ось вытянута вдоль своего измерения (как np.ix_)"""
+    return np.ix_(*[np.asarray(axis, dtype=np.float64) for axis in axes])
+
+
+def S_shaped_curve(T, E):
+    """Модель S-образной характеристики для системы W-Cs, А/см²"""
+    # Типичные параметры для аппроксимации
+    j_sat = 1.0  # А/см² - ток насыщения
+    T_opt = 1200 # K - оптимальная температура
+    width = 200  # K - ширина пика
+
+    # S-образная зависимость
+    return j_sat * np.exp(-((T - T_opt)/width)**2) * (1 + 0.1 * np.log10(E/1e5))
+
+
+def calculate_delta_phi(j_e, T, A=A, phi_W=phi_W):
+    """
+    Снижение работы выхода из уравнения Ричардсона j_e = A·T²·exp(-(φ_W - Δφ)/kT), эВ.
+    При j_e <= 0 возвращается φ_W, отрицательные значения заменяются нулем.
+    """
+    kT_eV = k * T / e  # kT в эВ
+    exponent_arg = j_e / (A * T**2)
+    positive = exponent_arg > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta_phi = phi_W + kT_eV * np.log(np.where(positive, exponent_arg, 1))
+    return np.where(positive, np.maximum(0, delta_phi), phi_W)
+
+
+def calculate_theta(delta_phi, phi_W=phi_W, phi_Cs=phi_Cs):
+    """Степень покрытия из баланса работ выхода Δφ = θ·(φ_W - φ_Cs), ограниченная [0, 1]"""
+    if phi_W == phi_Cs:
+        return np.zeros_like(np.asarray(delta_phi, dtype=np.float64))
+    return np.clip(delta_phi / (phi_W - phi_Cs), 0, 1)
+
+
+def emission_current_with_field(T, E, phi_W=phi_W, delta_phi=0.0, A=A):
+    """
+    Ток эмиссии Ричардсона–Шоттки j = A·T²·exp(-φ_eff/kT), А/см²,
+    φ_eff = φ_W - Δφ - 3.62e-4·sqrt(E). Возвращает (j, φ_eff).
+    """
+    kT_eV = k * T / e  # kT в эВ
+    delta_phi_field = SCHOTTKY_COEFFICIENT * np.sqrt(E)  # в эВ
+    phi_eff = phi_W - delta_phi - delta_phi_field
+    j = A * T**2 * np.exp(-phi_eff / kT_eV)
+    return j, phi_eff
+
+
+def calculate_Cs_pressure(T_Cs):
+    """Давление насыщенных паров цезия p_Cs = 2.45e8·exp(-8910/T_Cs), мм рт.ст."""
+    return 2.45e8 * np.exp(-8910 / T_Cs)
+
+
+def cathode_maps(T, E, A=A, phi_W=phi_W, phi_Cs=phi_Cs):
+    """
+    Карты рабочих точек катода на сетке mesh(T, E): ток по S-диаграмме, Δφ, θ,
+    эффективная работа выхода и ток эмиссии с учетом поля.
+    """
+    T, E = np.asarray(T, dtype=np.float64), np.asarray(E, dtype=np.float64)
+    if T.ndim == 1 and E.ndim == 1:
+        T, E = mesh(T, E)
+    j_s = S_shaped_curve(T, E)
+    delta_phi = calculate_delta_phi(j_s, T, A, phi_W)
+    j, phi_eff = emission_current_with_field(T, E, phi_W, delta_phi, A)
+    return {
+        "j_s": np.broadcast_to(j_s, j.shape),
+        "delta_phi": np.broadcast_to(delta_phi, j.shape),
+        "theta": np.broadcast_to(calculate_theta(delta_phi, phi_W, phi_Cs), j.shape),
+        "phi_eff": phi_eff,
+        "j": j,
+    }
+
+
+def emission_surface(T, E, delta_phi, A=A, phi_W=phi_W):
+    """Трехмерная карта тока эмиссии j(T, E, Δφ) на сетке трех осей, А/см²"""
+    T, E, delta_phi = mesh(T, E, delta_phi)
+    return emission_current_with_field(T, E, phi_W, delta_phi, A)[0]
+
+
+if __name__ == "__main__":
+    T = np.linspace(800, 2000, 1000)
+    E = np.logspace(4, 7, 1000)
+
+    started = time.perf_counter()
+    maps = cathode_maps(T, E)
+    elapsed = time.perf_counter() - started
+    print(f"Карты {maps['j'].shape}: {elapsed * 1000:.1f} мс")
+
+    started = time.perf_counter()
+    surface = emission_surface(T[::5], E[::5], np.linspace(0, 3, 100))
+    elapsed = time.perf_counter() - started
+    print(f"Карта j(T, E, Δφ) {surface.shape}: {elapsed * 1000:.1f} мс")
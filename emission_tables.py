@@ -0,0 +1,215 @@
+"""
+Табличный вычислитель равновесного тока эмиссии катода W-Cs с контролируемой погрешностью.
+
+Логарифм величины (например, ln j) заранее вычисляется на тензорной сетке и затем
+интерполируется полилинейно в преобразованных координатах (1/T, sqrt(E), ...),
+в которых он почти линеен. Сетка равномерна по каждой оси; число ее интервалов
+удваивается по тем осям, где погрешность в серединах ячеек больше заданной rtol.
+Итоговая максимальная относительная погрешность проверяется по случайной выборке
+точек и хранится вместе с таблицей. Таблицы сохраняются в .npz и повторно загружаются.
+
+Поиск по таблице — это 2^d выборок по индексу на точку, что в NumPy дороже формул в
+замкнутом виде (ток Ричардсона–Шоттки, давление паров цезия), поэтому табулируются
+только дорогие величины: равновесный ток j(T_k, T_Cs, E), для которого иначе в каждой
+точке решается баланс покрытия (cs_coverage.solve_coverage), — equilibrium_table.
+"""
+import hashlib
+import itertools
+import os
+import time
+
+import numpy as np
+
+import cs_coverage
+import emission
+
+DEFAULT_TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".plasma_cache", "tables")
+
+# Преобразования координат: прямое и обратное
+TRANSFORMS = {
+    "linear": (lambda x: x, lambda t: t),
+    "inverse": (lambda x: 1 / x, lambda t: 1 / t),
+    "sqrt": (np.sqrt, np.square),
+    "log": (np.log, np.exp),
+}
+
+
+class LogTable:
+    """
+    Таблица ln f на равномерной по каждой оси сетке в преобразованных координатах.
+
+    bounds — пары (min, max) по осям в исходных единицах, transforms — имена
+    преобразований из TRANSFORMS, values — массив ln f формы (n_1, ..., n_d).
+    """
+
+    def __init__(self, bounds, transforms, values, max_error=np.nan):
+        self.bounds = [tuple(map(float, b)) for b in bounds]
+        self.transforms = list(transforms)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.max_error = float(max_error)
+        self.low = []
+        self.step = []
+        for (a, b), name, n in zip(self.bounds, self.transforms, self.values.shape):
+            ta, tb = TRANSFORMS[name][0](a), TRANSFORMS[name][0](b)
+            self.low.append(ta)
+            self.step.append((tb - ta) / (n - 1))
+        self.strides = np.array(self.values.strides) // self.values.itemsize
+        self._corner_offsets = np.array([np.dot(corner, self.strides)
+                                         for corner in itertools.product((0, 1), repeat=self.values.ndim)])
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def nodes(self, axis):
+        """Узлы оси axis в исходных единицах"""
+        n = self.values.shape[axis]
+        return TRANSFORMS[self.transforms[axis]][1](self.low[axis] + self.step[axis] * np.arange(n))
+
+    def log(self, *points):
+        """ln f в точках (массивы любых согласованных форм, вне таблицы — экстраполяция краем)"""
+        index = 0
+        fractions = []
+        for axis, p in enumerate(points):
+            g = TRANSFORMS[self.transforms[axis]][0](np.asarray(p, dtype=np.float64)) - self.low[axis]
+            g *= 1 / self.step[axis]
+            i = np.clip(g, 0, self.values.shape[axis] - 2).astype(np.intp)
+            g -= i
+            fractions.append(g)
+            index = index + i * self.strides[axis]
+        # все 2^d вершин ячейки одной выборкой, затем линейная интерполяция по осям с последней
+        corners = self.values.ravel()[np.asarray(index)[..., None] + self._corner_offsets]
+        for fraction in reversed(fractions):
+            low, high = corners[..., 0::2], corners[..., 1::2]
+            corners = low + np.asarray(fraction)[..., None] * (high - low)
+        return corners[..., 0]
+
+    def __call__(self, *points):
+        return np.exp(self.log(*points))
+
+    def save(self, path):
+        """Сохраняет таблицу в .npz"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path + ".tmp.npz", values=self.values, bounds=np.array(self.bounds),
+                 transforms=np.array(self.transforms), max_error=self.max_error)
+        os.replace(path + ".tmp.npz", path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["bounds"], [str(t) for t in data["transforms"]], data["values"],
+                       float(data["max_error"]))
+
+    @classmethod
+    def build(cls, func, bounds, transforms, rtol=1e-6, start=3, max_nodes=1 << 12,
+              check_points=200000, seed=0):
+        """
+        Строит таблицу ln func по осям bounds с относительной погрешностью func не хуже rtol.
+
+        func(*оси) должна принимать открытую сетку (массивы, согласованные по broadcasting)
+        и возвращать положительные значения. Пока погрешность в серединах ячеек вдоль
+        какой-либо оси больше rtol, число интервалов по этой оси удваивается (не более
+        max_nodes узлов). Затем погрешность проверяется в check_points случайных точках;
+        если она все еще больше rtol, сгущается ось с наибольшей погрешностью.
+        """
+        counts = [start] * len(bounds)
+        while True:
+            table = cls(bounds, transforms, np.zeros(counts))
+            axes = [table.nodes(axis) for axis in range(len(bounds))]
+            table.values[...] = np.log(func(*emission.mesh(*axes)))
+
+            errors = []
+            for axis in range(len(bounds)):
+                t = table.low[axis] + table.step[axis] * (np.arange(counts[axis] - 1) + 0.5)
+                middle = list(axes)
+                middle[axis] = TRANSFORMS[transforms[axis]][1](t)
+                exact = np.log(func(*emission.mesh(*middle)))
+                lower = np.take(table.values, np.arange(counts[axis] - 1), axis=axis)
+                upper = np.take(table.values, np.arange(1, counts[axis]), axis=axis)
+                errors.append(np.max(np.abs(np.expm1((lower + upper) / 2 - exact))))
+
+            refine = [axis for axis, error in enumerate(errors) if error > rtol]
+            if not refine:
+                table.max_error = table.measure_error(func, check_points, seed)
+                if table.max_error <= rtol:
+                    return table
+                refine = [int(np.argmax(errors))]
+            grown = False
+            for axis in refine:
+                if 2 * (counts[axis] - 1) + 1 <= max_nodes:
+                    counts[axis] = 2 * (counts[axis] - 1) + 1
+                    grown = True
+            if not grown:
+                table.max_error = table.measure_error(func, check_points, seed)
+                return table
+
+    def measure_error(self, func, points=200000, seed=0):
+        """Максимальная относительная погрешность f в случайных точках внутри таблицы"""
+        rng = np.random.default_rng(seed)
+        sample = []
+        for (a, b), name in zip(self.bounds, self.transforms):
+            forward, inverse = TRANSFORMS[name]
+            ta, tb = forward(a), forward(b)
+            sample.append(inverse(rng.uniform(min(ta, tb), max(ta, tb), points)))
+        return float(np.max(np.abs(np.expm1(self.log(*sample) - np.log(func(*sample))))))
+
+
+def _table_path(kind, params, sources, directory):
+    digest = hashlib.sha256()
+    for module in (emission,) + tuple(sources):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    digest.update(repr(params).encode())
+    return os.path.join(directory, f"{kind}-{digest.hexdigest()[:16]}.npz")
+
+
+def cached_table(kind, func, bounds, transforms, rtol, params=(), sources=(), directory=DEFAULT_TABLE_DIR):
+    """
+    Таблица с диска или новая (с сохранением). Ключ — параметры, границы, rtol и исходный
+    код emission.py и модулей sources, от которых зависит func.
+    """
+    path = _table_path(kind, (bounds, transforms, rtol, params), sources, directory)
+    if os.path.exists(path):
+        return LogTable.load(path)
+    table = LogTable.build(func, bounds, transforms, rtol)
+    table.save(path)
+    return table
+
+
+def _equilibrium_current(T_k, T_Cs, E):
+    return cs_coverage.solve_coverage(T_k, T_Cs=T_Cs, E_k=E)["j"]
+
+
+def equilibrium_table(T_k=(800, 2000), T_Cs=(250, 600), E=(1e4, 1e7), rtol=1e-4, directory=DEFAULT_TABLE_DIR):
+    """
+    Таблица равновесного тока эмиссии j(T_k, T_Cs, E) (покрытие θ из баланса адсорбции
+    и десорбции при давлении паров цезия для T_Cs) в координатах (1/T_k, 1/T_Cs, sqrt(E)).
+    """
+    return cached_table("equilibrium", _equilibrium_current, [T_k, T_Cs, E], ["inverse", "inverse", "sqrt"],
+                        rtol, sources=(cs_coverage,), directory=directory)
+
+
+if __name__ == "__main__":
+    def timed(func, *args, repeat=3):
+        best = np.inf
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    rng = np.random.default_rng(1)
+    n = 10 ** 6
+    T_k = rng.uniform(800, 2000, n)
+    T_Cs = rng.uniform(250, 600, n)
+    E = 10 ** rng.uniform(4, 7, n)
+
+    table = equilibrium_table()
+    exact_time = timed(_equilibrium_current, T_k, T_Cs, E)
+    table_time = timed(table, T_k, T_Cs, E)
+    print(f"равновесный ток j(T_k, T_Cs, E): узлов {table.shape}, "
+          f"макс. относительная погрешность {table.max_error:.1e}")
+    print(f"  решение баланса покрытия {exact_time * 1000:.1f} мс, таблица {table_time * 1000:.1f} мс "
+          f"на {n} точек (ускорение {exact_time / table_time:.2f}x)")
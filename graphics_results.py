@@ -1,129 +1,90 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+
+import matplotlib
 import matplotlib.pyplot as plt
-from calculations import *
+import numpy as np
+import calculations
+import decimation
+from decimation import decimate_markers, panel_size
 from matplotlib import rcParams
+from profiling import Profiler, stage
+from results_store import column_label, save_values
+
+# Разделы текстового отчета: заголовок и величины в порядке вывода
+REPORT_SECTIONS = [
+    ("ИСХОДНЫЕ ПАРАМЕТРЫ", [
+        "distances", "plasm_potential", "magnet_field", "magnet_field_tesla", "electron_current",
+        "ion_current", "electron_temperature", "ion_temperature", "elastic_en_time", "nonelastic_en_time",
+        "neutral_temperature", "kinetic_diameter_krypton", "volume_flow", "krypton_density", "mass_flow",
+        "neutral_mass_flow",
+    ]),
+    ("ФИЗИЧЕСКИЕ КОНСТАНТЫ", [
+        "k", "electron_mass", "elementary_charge", "dielectric_constant", "krypton_mass",
+        "krypton_atom_radius", "krypton_ionisation_potential", "a0",
+    ]),
+    ("СКОРОСТИ ЧАСТИЦ", ["electron_velocity", "ion_velocity", "neutral_velocity"]),
+    ("КОНЦЕНТРАЦИИ ЧАСТИЦ", ["electron_concentration", "ion_concentration", "neutral_concentration"]),
+    ("ПАРАМЕТРЫ ПЛАЗМЫ", [
+        "debye_radius", "number_of_particles_in_debye_sphere", "plasm_frequency", "electron_qoulon_logarithm",
+    ]),
+    ("ПАРАМЕТРЫ ДВИЖЕНИЯ ЧАСТИЦ", [
+        "electron_cycle_frequency", "ion_cycle_frequency", "electron_larmor_radius", "ion_larmor_radius",
+    ]),
+    ("СЕЧЕНИЯ СТОЛКНОВЕНИЙ", [
+        "neutral_neutral_collision_cross_section", "qoulon_collision_cross_section_electron",
+        "transport_cross_section_ions", "recharge_cross_section",
+    ]),
+    ("ЧАСТОТЫ СТОЛКНОВЕНИЙ ДЛЯ ЭЛЕКТРОНОВ", [
+        "electron_electron_collision_frequency", "electron_ion_collision_frequency",
+        "electron_neutral_collision_frequency", "overall_electron_collision_frequency",
+    ]),
+    ("ЧАСТОТЫ СТОЛКНОВЕНИЙ ДЛЯ ИОНОВ", [
+        "ion_ion_collision_frequency", "ion_neutral_collision_frequency", "overall_ion_collision_frequency",
+    ]),
+    ("ЧАСТОТЫ СТОЛКНОВЕНИЙ ДЛЯ НЕЙТРАЛЬНЫХ ЧАСТИЦ", [
+        "neutral_neutral_collision_frequency", "overall_neutral_collision_frequency",
+    ]),
+    ("ДЛИНЫ СВОБОДНОГО ПРОБЕГА", ["electron_free_path", "ion_free_path", "neutral_free_path"]),
+    ("ПАРАМЕТРЫ ХОЛЛА", ["electron_hall_parameter", "ion_hall_parameter"]),
+    ("ЭЛЕКТРОПРОВОДНОСТЬ", ["electric_conductivity_longitudal", "electric_conductivity_transversal"]),
+]
+
+
+def collect_results():
+    """Значения всех величин отчета для точек измерений"""
+    # величины точек измерений считаются при первом обращении (calculations.measurement_state)
+    return {name: getattr(calculations, name) for _, names in REPORT_SECTIONS for name in names}
+
+
+def save_results_to_store(directory="plasma_calculations_results"):
+    """
+    Сохраняет все вычисленные параметры плазмы в бинарное столбцовое хранилище
+    """
+    return save_values(directory, collect_results())
+
 
 # Функция для записи всех результатов в файл
-def save_results_to_file(filename="plasma_calculations_results.txt"):
+def save_results_to_file(filename="plasma_calculations_results.txt", store=None):
     """
-    Сохраняет все вычисленные параметры плазмы в текстовый файл
+    Сохраняет все вычисленные параметры плазмы в текстовый файл.
+    Если передано хранилище store, отчет строится по его данным.
     """
+    values = collect_results() if store is None else store
     with open(filename, 'w', encoding='utf-8') as f:
         f.write("РЕЗУЛЬТАТЫ РАСЧЕТОВ ПАРАМЕТРОВ ПЛАЗМЫ СПД\n")
         f.write("=" * 50 + "\n\n")
-        
-        # Исходные параметры
-        f.write("ИСХОДНЫЕ ПАРАМЕТРЫ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Расстояния (мм): {distances}\n")
-        f.write(f"Потенциал плазмы (В): {plasm_potential}\n")
-        f.write(f"Магнитное поле (Гс): {magnet_field}\n")
-        f.write(f"Магнитное поле (Тл): {magnet_field_tesla}\n")
-        f.write(f"Ток электронов (А): {electron_current}\n")
-        f.write(f"Ток ионов (А): {ion_current}\n")
-        f.write(f"Температура электронов (эВ): {electron_temperature}\n")
-        f.write(f"Температура ионов (эВ): {ion_temperature}\n")
-        f.write(f"Время упругого взаимодействия (с): {elastic_en_time}\n")
-        f.write(f"Время неупругого взаимодействия (с): {nonelastic_en_time}\n")
-        f.write(f"Температура нейтралов (К): {neutral_temperature}\n")
-        f.write(f"Кинетический диаметр криптона (м): {kinetic_diameter_krypton}\n")
-        f.write(f"Объемный расход криптона (м³/с): {volume_flow}\n")
-        f.write(f"Плотность криптона (кг/м³): {krypton_density}\n")
-        f.write(f"Массовый расход (кг/с): {mass_flow}\n")
-        f.write(f"Массовый расход нейтралов (кг/с): {neutral_mass_flow}\n\n")
-        
-        # Константы
-        f.write("ФИЗИЧЕСКИЕ КОНСТАНТЫ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Постоянная Больцмана (Дж/К): {k}\n")
-        f.write(f"Масса электрона (кг): {electron_mass}\n")
-        f.write(f"Элементарный заряд (Кл): {elementary_charge}\n")
-        f.write(f"Диэлектрическая постоянная (Ф/м): {dielectric_constant}\n")
-        f.write(f"Масса криптона (кг): {krypton_mass}\n")
-        f.write(f"Радиус атома криптона (м): {krypton_atom_radius}\n")
-        f.write(f"Потенциал ионизации криптона (эВ): {krypton_ionisation_potential}\n")
-        f.write(f"Боровский радиус (м): {a0}\n\n")
-        
-        # Скорости частиц
-        f.write("СКОРОСТИ ЧАСТИЦ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Скорость электронов (м/с): {electron_velocity}\n")
-        f.write(f"Скорость ионов (м/с): {ion_velocity}\n")
-        f.write(f"Скорость нейтралов (м/с): {neutral_velocity}\n\n")
-        
-        # Концентрации частиц
-        f.write("КОНЦЕНТРАЦИИ ЧАСТИЦ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Концентрация электронов (м^-3): {electron_concentration}\n")
-        f.write(f"Концентрация ионов (м^-3): {ion_concentration}\n")
-        f.write(f"Концентрация нейтралов (м^-3): {neutral_concentration}\n\n")
-        
-        # Параметры плазмы
-        f.write("ПАРАМЕТРЫ ПЛАЗМЫ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Радиус Дебая (м): {debye_radius}\n")
-        f.write(f"Число частиц в сфере Дебая: {number_of_particles_in_debye_sphere}\n")
-        f.write(f"Плазменная частота (рад/с): {plasm_frequency}\n")
-        f.write(f"Кулоновский Логарифм электрон: {electron_qoulon_logarithm}\n\n")
-
-        # Параметры движения частиц
-        f.write("ПАРАМЕТРЫ ДВИЖЕНИЯ ЧАСТИЦ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Циклотронная частота электронов (рад/с): {electron_cycle_frequency}\n")
-        f.write(f"Циклотронная частота ионов (рад/с): {ion_cycle_frequency}\n")
-        f.write(f"Радиус Лармора электронов (м): {electron_larmor_radius}\n")
-        f.write(f"Радиус Лармора ионов (м): {ion_larmor_radius}\n")
-        
-        # Сечения столкновений
-        f.write("СЕЧЕНИЯ СТОЛКНОВЕНИЙ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Сечение столкновения нейтрал-нейтрал (м^2): {neutral_neutral_collision_cross_section}\n")
-        f.write(f"Сечение кулоновского столкновения для электронов (м^2): {qoulon_collision_cross_section_electron}\n")
-        f.write(f"Транспортное сечение ионов (м^2): {transport_cross_section_ions}\n")
-        f.write(f"Сечение перезарядки (м^2): {recharge_cross_section}\n\n")
-        
-        # Частоты столкновений для электронов
-        f.write("ЧАСТОТЫ СТОЛКНОВЕНИЙ ДЛЯ ЭЛЕКТРОНОВ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Частота столкновений электрон-электрон (с^-1): {electron_electron_collision_frequency}\n")
-        f.write(f"Частота столкновений электрон-ион (с^-1): {electron_ion_collision_frequency}\n")
-        f.write(f"Частота столкновений электрон-нейтрал (с^-1): {electron_neutral_collision_frequency}\n")
-        f.write(f"Общая частота столкновений электронов (с^-1): {overall_electron_collision_frequency}\n\n")
-        
-        # Частоты столкновений для ионов
-        f.write("ЧАСТОТЫ СТОЛКНОВЕНИЙ ДЛЯ ИОНОВ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Частота столкновений ион-ион (с^-1): {ion_ion_collision_frequency}\n")
-        f.write(f"Частота столкновений ион-нейтрал (с^-1): {ion_neutral_collision_frequency}\n")
-        f.write(f"Общая частота столкновений ионов (с^-1): {overall_ion_collision_frequency}\n\n")
-        
-        # Частоты столкновений для нейтральных частиц
-        f.write("ЧАСТОТЫ СТОЛКНОВЕНИЙ ДЛЯ НЕЙТРАЛЬНЫХ ЧАСТИЦ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Частота столкновений нейтрал-нейтрал (с^-1): {neutral_neutral_collision_frequency}\n")
-        f.write(f"Общая частота столкновений нейтралов (с^-1): {overall_neutral_collision_frequency}\n\n")
-        
-        # Длины свободного пробега
-        f.write("ДЛИНЫ СВОБОДНОГО ПРОБЕГА:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Длина свободного пробега электронов (м): {electron_free_path}\n")
-        f.write(f"Длина свободного пробега ионов (м): {ion_free_path}\n")
-        f.write(f"Длина свободного пробега нейтралов (м): {neutral_free_path}\n\n")
-
-        # Параметры Холла
-        f.write("ПАРАМЕТРЫ ХОЛЛА:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Параметр Холла для электронов: {electron_hall_parameter}\n")
-        f.write(f"Параметр Холла для ионов: {ion_hall_parameter}\n\n")
-
-        # Электропроводность
-        f.write("ЭЛЕКТРОПРОВОДНОСТЬ:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Электропроводность вдоль магнитного поля (См/м): {electric_conductivity_longitudal}\n")
-        f.write(f"Электропроводность поперек магнитного поля (См/м): {electric_conductivity_transversal}\n\n")
-
-# Вызов функции
-save_results_to_file()
-print("Все результаты сохранены в файл 'plasma_calculations_results.txt'")
+
+        for title, names in REPORT_SECTIONS:
+            f.write(f"{title}:\n")
+            f.write("-" * 30 + "\n")
+            for name in names:
+                f.write(f"{column_label(name)}: {values[name]}\n")
+            f.write("\n")
 
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']       # для всех обычных надписей
@@ -138,19 +99,36 @@ rcParams['ytick.labelsize'] = 16
 rcParams['legend.fontsize'] = 16
 rcParams['figure.titlesize'] = 24
 rcParams['figure.autolayout'] = True
-def plot_results():
 
-    # -------- Список графиков для автоматической обработки --------
-    plots = [
+# Величины, которые используются на графиках
+PLOT_QUANTITIES = (
+    "electron_concentration", "ion_concentration", "neutral_concentration", "electron_temperature",
+    "ion_temperature", "electron_velocity", "ion_velocity", "electron_hall_parameter", "ion_hall_parameter",
+    "overall_electron_collision_frequency", "overall_ion_collision_frequency",
+    "overall_neutral_collision_frequency", "electron_free_path", "ion_free_path", "neutral_free_path",
+    "electric_conductivity_longitudal", "electric_conductivity_transversal", "electron_larmor_radius",
+    "ion_larmor_radius", "plasm_potential", "magnet_field",
+)
+
+
+def collect_plot_values():
+    """Величины для графиков по точкам измерений"""
+    names = PLOT_QUANTITIES + ("distances",)
+    return {name: getattr(calculations, name) for name in names}
+
+
+def plot_specs(values):
+    """Список графиков (по одной панели на элемент) для набора величин values"""
+    return [
         # 1
         {
             "title": "Концентрации частиц",
             "ylabels": r'Концентрация, м$^{-3}$',
             "yscale": "log",
             "series": [
-                (electron_concentration, r'$n_e$', 'ro'),
-                (ion_concentration, r'$n_i$', 'bo'),
-                (neutral_concentration, r'$n_n$', 'go')
+                (values["electron_concentration"], r'$n_e$', 'ro'),
+                (values["ion_concentration"], r'$n_i$', 'bo'),
+                (values["neutral_concentration"], r'$n_n$', 'go')
             ]
         },
         # 2
@@ -158,8 +136,8 @@ def plot_results():
             "title": "Температуры частиц",
             "ylabels": "Температура, эВ",
             "series": [
-                (electron_temperature, r'$T_e$', 'ro'),
-                (ion_temperature, r'$T_i$', 'bo')
+                (values["electron_temperature"], r'$T_e$', 'ro'),
+                (values["ion_temperature"], r'$T_i$', 'bo')
             ]
         },
         # 3
@@ -168,8 +146,8 @@ def plot_results():
             "ylabels": "Скорость, м/с",
             "yscale": "log",
             "series": [
-                (electron_velocity, r'$v_e$', 'ro'),
-                (ion_velocity, r'$v_i$', 'bo')
+                (values["electron_velocity"], r'$v_e$', 'ro'),
+                (values["ion_velocity"], r'$v_i$', 'bo')
             ]
         },
         # 4
@@ -178,8 +156,8 @@ def plot_results():
             "ylabels": "Параметр Холла",
             "yscale": "log",
             "series": [
-                (electron_hall_parameter, r'$\beta_e$', 'ro'),
-                (ion_hall_parameter, r'$\beta_i$', 'bo')
+                (values["electron_hall_parameter"], r'$\beta_e$', 'ro'),
+                (values["ion_hall_parameter"], r'$\beta_i$', 'bo')
             ]
         },
         # 5
@@ -188,9 +166,9 @@ def plot_results():
             "ylabels": "Частота столкновений, с⁻¹",
             "yscale": "log",
             "series": [
-                (overall_electron_collision_frequency, r'$\nu_e$', 'ro'),
-                (overall_ion_collision_frequency, r'$\nu_i$', 'bo'),
-                (overall_neutral_collision_frequency, r'$\nu_n$', 'go')
+                (values["overall_electron_collision_frequency"], r'$\nu_e$', 'ro'),
+                (values["overall_ion_collision_frequency"], r'$\nu_i$', 'bo'),
+                (values["overall_neutral_collision_frequency"], r'$\nu_n$', 'go')
             ]
         },
         # 6
@@ -199,9 +177,9 @@ def plot_results():
             "ylabels": "Длина свободного пробега, м",
             "yscale": "log",
             "series": [
-                (electron_free_path, r'$\lambda_e$', 'ro'),
-                (ion_free_path, r'$\lambda_i$', 'bo'),
-                (neutral_free_path, r'$\lambda_n$', 'go')
+                (values["electron_free_path"], r'$\lambda_e$', 'ro'),
+                (values["ion_free_path"], r'$\lambda_i$', 'bo'),
+                (values["neutral_free_path"], r'$\lambda_n$', 'go')
             ]
         },
         # 7
@@ -210,8 +188,8 @@ def plot_results():
             "ylabels": "Электропроводность, См/м",
             "yscale": "log",
             "series": [
-                (electric_conductivity_longitudal, r'$\sigma_\parallel$', 'ro'),
-                (electric_conductivity_transversal, r'$\sigma_\perp$', 'bo')
+                (values["electric_conductivity_longitudal"], r'$\sigma_\parallel$', 'ro'),
+                (values["electric_conductivity_transversal"], r'$\sigma_\perp$', 'bo')
             ]
         },
         # 8
@@ -220,8 +198,8 @@ def plot_results():
             "ylabels": "Радиус Лармора, м",
             "yscale": "log",
             "series": [
-                (electron_larmor_radius, r'$r_{Le}$', 'ro'),
-                (ion_larmor_radius, r'$r_{Li}$', 'bo')
+                (values["electron_larmor_radius"], r'$r_{Le}$', 'ro'),
+                (values["ion_larmor_radius"], r'$r_{Li}$', 'bo')
             ]
         },
         # 9
@@ -229,57 +207,241 @@ def plot_results():
             "title": "Потенциал плазмы и магнитное поле",
             "ylabels": "Потенциал плазмы, В",
             "series": [
-                (plasm_potential, r'$\varphi$', 'ro')
+                (values["plasm_potential"], r'$\varphi$', 'ro')
             ],
-            "magnet": True  # особая обработка
+            "magnet": (values["magnet_field"], r'$B$', 'bo')  # вторая ось
         }
     ]
 
-    # =================== генерация по 4 графика на картинку ===================
-    page = 1
-    for i in range(0, len(plots), 4):
-        part = plots[i:i+4]
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        fig.suptitle(f"Параметры плазмы (лист {page})", fontsize=18, fontweight='bold')
-
-        for ax, plot in zip(axes.flat, part):
-
-            # стандартные графики
-            if "magnet" not in plot:
-
-                for data, label, style in plot["series"]:
-                    ax.plot(distances, data, style, marker='o', linestyle='none', label=label)
-
-                if "yscale" in plot:
-                    ax.set_yscale(plot["yscale"])
-                ax.set_title(plot["title"])
-                ax.set_ylabel(plot["ylabels"])
-                ax.set_xlabel("Расстояние, мм")
-                ax.grid(True, alpha=0.3)
-                ax.legend()
-
-            # последний график с двумя осями
-            else:
-                ax.plot(distances, plasm_potential, 'ro', marker='o', linestyle='none', label=r'$\varphi$')
-                ax.set_ylabel("Потенциал плазмы, В", color='r')
-                ax.tick_params(axis='y', labelcolor='r')
-                ax.set_xlabel("Расстояние, мм")
-                ax.set_title(plot["title"])
-                ax.grid(True, alpha=0.3)
-
-                ax2 = ax.twinx()
-                ax2.plot(distances, magnet_field, 'bo', marker='o', linestyle='none', label=r'$B$')
-                ax2.set_ylabel("Магнитное поле, Гс", color='b')
-                ax2.tick_params(axis='y', labelcolor='b')
-
-        plt.tight_layout()
-        fname = f"plasma_plots_page_{page}.png"
-        plt.savefig(fname, dpi=300, bbox_inches='tight')
+
+def page_jobs(values, prefix="", out_dir="", dpi=300, x=None, xlabel="Расстояние, мм"):
+    """
+    Задания на отрисовку листов (по 4 графика) для набора величин values.
+    По оси абсцисс — x (по умолчанию values["distances"]).
+    """
+    plots = plot_specs(values)
+    x = values["distances"] if x is None else x
+    jobs = []
+    for page, i in enumerate(range(0, len(plots), 4), start=1):
+        filename = os.path.join(out_dir, f"{prefix}plasma_plots_page_{page}.png")
+        jobs.append({"part": plots[i:i+4], "page": page, "x": x, "xlabel": xlabel,
+                     "filename": filename, "dpi": dpi})
+    return jobs
+
+
+def draw_page(job):
+    """Строит фигуру одного листа 2x2"""
+    x, xlabel = job["x"], job["xlabel"]
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig.suptitle(f"Параметры плазмы (лист {job['page']})", fontsize=18, fontweight='bold')
+    # плотные ряды (все ряды рисуются маркерами) прореживаются до пиксельных ячеек панели
+    # итогового файла
+    width, height = panel_size(axes.flat[0], job["dpi"])
+
+    for ax, plot in zip(axes.flat, job["part"]):
+
+        # стандартные графики
+        if "magnet" not in plot:
+
+            if "yscale" in plot:
+                ax.set_yscale(plot["yscale"])
+            ylog = plot.get("yscale") == "log"
+            for data, label, style in plot["series"]:
+                xs, ys = decimate_markers(x, data, width, height, ylog=ylog)
+                ax.plot(xs, ys, style, marker='o', linestyle='none', label=label)
+
+            ax.set_title(plot["title"])
+            ax.set_ylabel(plot["ylabels"])
+            ax.set_xlabel(xlabel)
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+
+        # последний график с двумя осями
+        else:
+            data, label, style = plot["series"][0]
+            xs, ys = decimate_markers(x, data, width, height)
+            ax.plot(xs, ys, style, marker='o', linestyle='none', label=label)
+            ax.set_ylabel(plot["ylabels"], color='r')
+            ax.tick_params(axis='y', labelcolor='r')
+            ax.set_xlabel(xlabel)
+            ax.set_title(plot["title"])
+            ax.grid(True, alpha=0.3)
+
+            ax2 = ax.twinx()
+            data, label, style = plot["magnet"]
+            xs, ys = decimate_markers(x, data, width, height)
+            ax2.plot(xs, ys, style, marker='o', linestyle='none', label=label)
+            ax2.set_ylabel("Магнитное поле, Гс", color='b')
+            ax2.tick_params(axis='y', labelcolor='b')
+
+    fig.tight_layout()
+    return fig
+
+
+def _init_headless():
+    # процессы пула рисуют без окон
+    matplotlib.use("Agg")
+
+
+def _render_page(job):
+    name = os.path.basename(job["filename"])
+    with stage(f"draw {name}", "plots"):
+        fig = draw_page(job)
+    with stage(f"save {name}", "plots"):
+        fig.savefig(job["filename"], dpi=job["dpi"], bbox_inches='tight')
+    plt.close(fig)
+    return job["filename"]
+
+
+def _feed(digest, obj):
+    """Добавляет в хэш массивы, списки, словари и простые значения"""
+    if isinstance(obj, np.ndarray):
+        value = np.ascontiguousarray(obj)
+        digest.update(f"array|{value.dtype.str}|{value.shape}|".encode())
+        digest.update(value.tobytes())
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f"seq|{len(obj)}|".encode())
+        for item in obj:
+            _feed(digest, item)
+    elif isinstance(obj, dict):
+        digest.update(f"dict|{len(obj)}|".encode())
+        for key in sorted(obj):
+            _feed(digest, key)
+            _feed(digest, obj[key])
+    else:
+        digest.update(f"{type(obj).__name__}|{obj!r}|".encode())
+
+
+def panel_hash(plot, x, xlabel):
+    """Хэш содержимого панели: данные и оформление всех рядов, ось абсцисс"""
+    digest = hashlib.sha256()
+    _feed(digest, [plot, np.asarray(x), xlabel])
+    return digest.hexdigest()
+
+
+def _style_version():
+    """
+    Хэш кода отрисовки (этот модуль и decimation.py), версии и настроек matplotlib:
+    их изменение перерисовывает все листы
+    """
+    digest = hashlib.sha256()
+    for path in (__file__, decimation.__file__):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    digest.update(matplotlib.__version__.encode())
+    _feed(digest, {key: repr(value) for key, value in rcParams.items() if not key.startswith("backend")})
+    return digest.hexdigest()
+
+
+def page_hash(job, panels, style):
+    """Хэш листа по хэшам его панелей, номеру, разрешению и версии оформления"""
+    digest = hashlib.sha256()
+    _feed(digest, [style, job["page"], job["dpi"], panels])
+    return digest.hexdigest()
+
+
+def render_pages(page_sets, out_dir="", workers=None, dpi=300, incremental=True,
+                 manifest_name="plot_manifest.json"):
+    """
+    Пакетная отрисовка листов без окон (backend Agg) в пуле процессов.
+
+    page_sets — словарь {префикс имени файла: набор величин} (например, по одному набору
+    на рабочую точку или срез развертки); набор может содержать "x" и "xlabel" для оси
+    абсцисс. Листы всех наборов рисуются параллельно.
+
+    В манифесте (manifest_name в out_dir) для каждого листа хранятся хэши его панелей.
+    При incremental=True листы, хэш которых не изменился и файл которых существует,
+    не перерисовываются. Возвращает манифест со списками "rendered" и "reused".
+    """
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, manifest_name)
+    previous = {}
+    if incremental and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f).get("pages", {})
+
+    pages, jobs, reused = {}, [], []
+    with stage("hash pages", "plots"):
+        style = _style_version()
+        for prefix, values in page_sets.items():
+            for job in page_jobs(values, prefix, out_dir, dpi, x=values.get("x"),
+                                 xlabel=values.get("xlabel", "Расстояние, мм")):
+                panels = [panel_hash(plot, job["x"], job["xlabel"]) for plot in job["part"]]
+                name = os.path.basename(job["filename"])
+                pages[name] = {"hash": page_hash(job, panels, style), "panels": panels}
+                if previous.get(name, {}).get("hash") == pages[name]["hash"] and os.path.exists(job["filename"]):
+                    reused.append(name)
+                else:
+                    jobs.append(job)
+
+    if workers == 1 or len(jobs) <= 1:
+        _init_headless()
+        rendered = [_render_page(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_headless) as pool:
+            rendered = pool.map(_render_page, jobs, chunksize=1)
+
+    manifest = {
+        "version": 1,
+        "pages": pages,
+        "rendered": [os.path.basename(name) for name in rendered],
+        "reused": reused,
+    }
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+
+def plot_results():
+
+    # -------- графики для точек измерений, по 4 на картинку --------
+    for job in page_jobs(collect_plot_values()):
+        draw_page(job)
+        fname = job["filename"]
+        plt.savefig(fname, dpi=job["dpi"], bbox_inches='tight')
         plt.show()
         print(f"Сохранено: {fname}")
-        page += 1
 
 
-# запуск
-plot_results()
-print("Графики сохранены в файлы 'plasma_parameters_plots.png'")
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Отчет и графики параметров плазмы СПД")
+    parser.add_argument("--headless", action="store_true",
+                        help="рисовать листы без окон в пуле процессов")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true",
+                        help="перерисовать все листы, даже если данные не изменились")
+    parser.add_argument("--profile", metavar="TRACE",
+                        help="профилировать этапы и сохранить Chrome trace в файл TRACE")
+    args = parser.parse_args()
+
+    profiler = Profiler() if args.profile else contextlib.nullcontext()
+    with profiler:
+        # цепочка расчета для точек измерений считается внутри профилировщика, чтобы
+        # в профиле были этапы отдельных величин
+        with stage("measurement_state", "calculations"):
+            calculations.measurement_state()
+
+        # Вызов функции
+        with stage("save_results_to_store", "output"):
+            results_store = save_results_to_store()
+        with stage("save_results_to_file", "output"):
+            save_results_to_file(store=results_store)
+        print("Все результаты сохранены в файл 'plasma_calculations_results.txt'")
+
+        # запуск
+        if args.headless:
+            manifest = render_pages({"": collect_plot_values()}, workers=args.workers,
+                                    incremental=not args.force)
+            for fname in manifest["rendered"]:
+                print(f"Сохранено: {fname}")
+            for fname in manifest["reused"]:
+                print(f"Без изменений: {fname}")
+        else:
+            plot_results()
+        print("Графики сохранены в файлы 'plasma_parameters_plots.png'")
+
+    if args.profile:
+        print(profiler.summary())
+        print(f"Chrome trace: {profiler.write_trace(args.profile)}")
@@ -0,0 +1,216 @@
+"""
+Слитный расчет цепочки столкновений и переноса (от скорости электронов до поперечной
+электропроводности) в заранее выделенные буферы.
+
+Цепочка считается блоками по block_size точек операциями NumPy с out=, все промежуточные
+величины живут в нескольких переиспользуемых рабочих массивах, поэтому дополнительная
+память не зависит от N. Порядок арифметических операций совпадает с calculations.py.
+"""
+import numpy as np
+
+from calculations import (
+    INPUT_DEFAULTS,
+    SPECIES_INPUTS,
+    _as_columns,
+    a0,
+    dielectric_constant,
+    elementary_charge,
+    electron_mass,
+    k,
+    krypton_atom_radius,
+    krypton_ionisation_potential,
+    krypton_mass,
+    square_of_channel,
+)
+
+# Величины, которые может выдать слитная цепочка
+FUSED_OUTPUTS = (
+    "overall_electron_collision_frequency",
+    "overall_ion_collision_frequency",
+    "electron_hall_parameter",
+    "ion_hall_parameter",
+    "electric_conductivity_longitudal",
+    "electric_conductivity_transversal",
+)
+
+# Входные столбцы, которые читает слитная цепочка
+FUSED_INPUTS = (
+    "plasm_potential",
+    "magnet_field",
+    "ion_current",
+    "electron_temperature",
+    "elastic_en_time",
+    "nonelastic_en_time",
+    "neutral_concentration",
+    "neutral_temperature",
+)
+
+# Имена рабочих массивов блока (невостребованные выходные величины тоже считаются в них)
+_SCRATCH = (
+    "electron_velocity", "ion_velocity", "neutral_velocity", "ion_concentration",
+    "logarithm", "cross_section", "electron_ion", "electron_neutral", "work", "velocity_difference",
+) + FUSED_OUTPUTS
+
+
+class Workspace:
+    """Рабочие буферы для блока из block_size точек; один экземпляр можно переиспользовать между вызовами"""
+
+    def __init__(self, block_size=1 << 16):
+        self.block_size = block_size
+        self._buffers = np.empty((len(_SCRATCH), block_size))
+
+    def buffers(self, size):
+        """Словарь рабочих массивов длины size (представления общих буферов)"""
+        return {name: row[:size] for name, row in zip(_SCRATCH, self._buffers)}
+
+
+def _fused_block(c, s, o):
+    """Цепочка для одного блока: c — входные столбцы, s — рабочие массивы, o — выходные срезы"""
+    e = elementary_charge
+    w = s["work"]
+
+    # Скорости частиц (м/с)
+    ve = s["electron_velocity"]
+    np.multiply(c["electron_temperature"], 8*k, out=ve)
+    ve *= 11600
+    ve /= np.pi*electron_mass
+    np.sqrt(ve, out=ve)
+
+    vi = s["ion_velocity"]
+    np.subtract(200, c["plasm_potential"], out=vi)
+    vi *= e
+    vi /= 2*krypton_mass
+    np.sqrt(vi, out=vi)
+
+    vn = s["neutral_velocity"]
+    np.multiply(c["neutral_temperature"], 3*k, out=vn)
+    vn /= krypton_mass
+    np.sqrt(vn, out=vn)
+
+    # Концентрация ионов (= электронов), м⁻³
+    n = s["ion_concentration"]
+    np.divide(c["ion_current"], square_of_channel, out=n)
+    np.multiply(vi, e, out=w)
+    n /= w
+
+    # Кулоновский логарифм ln(λ_D/b_min): сначала λ_D, затем b_min в рабочем массиве
+    L = s["logarithm"]
+    np.multiply(c["electron_temperature"], dielectric_constant * k, out=L)
+    L *= 11600
+    np.multiply(n, elementary_charge ** 2, out=w)
+    L /= w
+    np.sqrt(L, out=L)
+    np.multiply(c["electron_temperature"], 4*np.pi*dielectric_constant, out=w)
+    w *= e
+    np.divide(elementary_charge ** 2, w, out=w)
+    L /= w
+    np.log(L, out=L)
+
+    # Кулоновское сечение (м²)
+    Q = s["cross_section"]
+    np.multiply(L, 2.87e-18, out=Q)
+    np.multiply(c["electron_temperature"], c["electron_temperature"], out=w)
+    Q /= w
+
+    # Частоты столкновений для электронов (с⁻¹)
+    ei = s["electron_ion"]
+    np.multiply(Q, n, out=ei)
+    ei *= ve
+    en = s["electron_neutral"]
+    np.divide(1, c["elastic_en_time"], out=en)
+    np.divide(1, c["nonelastic_en_time"], out=w)
+    en += w
+    nu_e = o["overall_electron_collision_frequency"]
+    np.multiply(ei, (2) ** 0.5, out=nu_e)
+    nu_e += ei
+    nu_e += en
+
+    # Электропроводность вдоль поля (См/м); ve больше не нужна — используем ее буфер
+    sigma = o["electric_conductivity_longitudal"]
+    np.multiply(n, elementary_charge ** 2, out=sigma)
+    np.add(en, ei, out=ve)
+    ve *= electron_mass
+    sigma /= ve
+
+    # Транспортное сечение и сечение перезарядки ионов (м²)
+    dv = s["velocity_difference"]
+    np.subtract(vi, vn, out=dv)
+    R = s["neutral_velocity"]
+    np.multiply(dv, dv, out=R)
+    R *= krypton_mass
+    R /= 2
+    R *= 6.24e18
+    np.divide(krypton_ionisation_potential, R, out=R)
+    R *= (krypton_atom_radius/0.62) ** 3 / (a0 ** 3)
+    np.sqrt(R, out=R)
+    R *= 2 * np.pi * (2 ** 0.5) * (a0 ** 2)
+    R /= 2
+
+    # Частоты столкновений для ионов (с⁻¹)
+    nu_i = o["overall_ion_collision_frequency"]
+    np.multiply(Q, n, out=nu_i)
+    nu_i *= vi
+    nu_i *= (2) ** 0.5
+    np.multiply(dv, c["neutral_concentration"], out=w)
+    w *= R
+    w *= 3/2
+    nu_i += w
+    nu_i += ei
+
+    # Параметры Холла
+    beta_e = o["electron_hall_parameter"]
+    np.divide(c["magnet_field"], 10000, out=w)
+    np.multiply(w, e, out=beta_e)
+    beta_e /= electron_mass
+    beta_e /= nu_e
+    beta_i = o["ion_hall_parameter"]
+    np.multiply(w, e, out=beta_i)
+    beta_i /= krypton_mass
+    beta_i /= nu_i
+
+    # Электропроводность поперек поля (См/м)
+    sigma_perp = o["electric_conductivity_transversal"]
+    np.multiply(beta_e, beta_e, out=w)
+    w += 1
+    np.divide(beta_e, w, out=w)
+    np.multiply(sigma, w, out=sigma_perp)
+
+
+def transport_chain(inputs, outputs=FUSED_OUTPUTS, out=None, workspace=None):
+    """
+    Слитный расчет величин outputs (из FUSED_OUTPUTS) для N точек.
+
+    inputs — те же столбцы, что и для compute_plasma_state; out — необязательный словарь
+    заранее выделенных выходных массивов длины N (недостающие создаются);
+    workspace — переиспользуемый Workspace. Память сверх входов и выходов — только
+    рабочие буферы одного блока. Возвращает словарь выходных массивов.
+    """
+    for name in outputs:
+        if name not in FUSED_OUTPUTS:
+            raise ValueError(f"Величина {name} не считается слитной цепочкой")
+    columns = _as_columns(inputs)
+    for name in SPECIES_INPUTS:
+        if np.any(columns[name] != INPUT_DEFAULTS[name]):
+            raise ValueError(f"Слитная цепочка считается только для криптона (задан столбец {name})")
+    for name in FUSED_INPUTS:
+        if name not in columns:
+            raise ValueError(f"Не задан входной столбец: {name}")
+    size = np.broadcast_shapes(*(np.shape(columns[name]) for name in FUSED_INPUTS))
+    if len(size) != 1:
+        raise ValueError("Входные столбцы должны быть одномерными")
+    size = size[0]
+
+    out = {name: array for name, array in (out or {}).items() if name in outputs}
+    for name in outputs:
+        if name not in out:
+            out[name] = np.empty(size)
+    workspace = workspace or Workspace()
+
+    for start in range(0, size, workspace.block_size):
+        stop = min(start + workspace.block_size, size)
+        block = {name: columns[name][start:stop] if np.ndim(columns[name]) else columns[name]
+                 for name in FUSED_INPUTS}
+        scratch = workspace.buffers(stop - start)
+        results = {name: out[name][start:stop] if name in out else scratch[name] for name in FUSED_OUTPUTS}
+        _fused_block(block, scratch, results)
+    return out
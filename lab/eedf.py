@@ -0,0 +1,133 @@
+"""
+Функция распределения электронов по энергиям (ФРЭЭ) по методу Дрювестейна для стопки ВАХ.
+
+Все ВАХ сразу переносятся на равномерные сетки напряжения (своя сетка для каждой кривой,
+одинаковое число узлов), сглаживаются и дважды дифференцируются фильтром Савицкого–Голея
+вдоль последней оси. По второй производной тока d²I/dU² в тормозящей области (U < Vp)
+вычисляются ФРЭЭ, концентрация электронов и эффективная температура 2/3·<ε>.
+"""
+import time
+
+import numpy as np
+from scipy.signal import savgol_filter
+
+from probe import sort_sweeps, synthetic_sweeps
+
+electron_mass = 9.11e-31  # кг
+elementary_charge = 1.6e-19  # Кл
+
+# Площадь собирающей поверхности зонда по умолчанию: цилиндр d = 0.5 мм, l = 5 мм
+# (задайте геометрию своего зонда)
+DEFAULT_PROBE_AREA = np.pi * 0.5e-3 * 5e-3  # м²
+
+
+def batched_interp(x_new, x, y):
+    """
+    Линейная интерполяция строк y(x) в точки x_new для всех строк сразу (одним np.interp).
+    x отсортированы по строкам, значения NaN пропускаются; вне диапазона строки — NaN.
+    """
+    x_new = np.atleast_2d(x_new)
+    valid = np.isfinite(x) & np.isfinite(y)
+    low = np.minimum(np.nanmin(x, axis=-1), np.nanmin(x_new, axis=-1))[:, None]
+    high = np.maximum(np.nanmax(x, axis=-1), np.nanmax(x_new, axis=-1))[:, None]
+    span = np.where(high > low, high - low, 1)
+    # строки разносятся по непересекающимся отрезкам [2r, 2r + 1]
+    offset = 2 * np.arange(len(x))[:, None]
+    keys = (x - low) / span + offset
+    new_keys = (x_new - low) / span + offset
+    result = np.interp(new_keys.ravel(), keys[valid], y[valid]).reshape(new_keys.shape)
+    first = np.nanmin(np.where(valid, x, np.nan), axis=-1)[:, None]
+    last = np.nanmax(np.where(valid, x, np.nan), axis=-1)[:, None]
+    return np.where((x_new >= first) & (x_new <= last), result, np.nan)
+
+
+def uniform_sweeps(U, I, points=256):
+    """ВАХ на равномерных сетках напряжения: (сетки (M, points), токи (M, points), шаги (M,))"""
+    U, I = sort_sweeps(U, I)
+    low = np.nanmin(U, axis=-1)
+    high = np.nanmax(U, axis=-1)
+    grid = low[:, None] + (high - low)[:, None] * np.linspace(0, 1, points)
+    return grid, batched_interp(grid, U, I), (high - low) / (points - 1)
+
+
+def druyvesteyn(U, I, probe_area=DEFAULT_PROBE_AREA, plasm_potential=None, points=256,
+                window=21, polyorder=3, energies=None):
+    """
+    ФРЭЭ стопки ВАХ U, I формы (M, P) (В, А) по формуле Дрювестейна
+
+        f(ε) = 2 m / (e² A) · sqrt(2 e ε / m) · d²I/dU²,  ε = Vp - U.
+
+    Потенциал плазмы Vp берется из plasm_potential или, если он не задан, по максимуму
+    сглаженной первой производной тока. В возвращаемой ФРЭЭ отрицательные из-за шума
+    значения заменяются нулем.
+
+    Возвращает словарь:
+      "energy" — сетка энергий energies, эВ (по умолчанию 0–50 эВ);
+      "eedf" — ФРЭЭ на этой сетке формы (M, len(energies)), м^-3·эВ^-1;
+      "electron_concentration" — концентрация электронов ∫f dε, м^-3;
+      "electron_temperature" — эффективная температура 2/3·<ε>, эВ;
+      "plasm_potential" — использованный потенциал плазмы, В.
+    """
+    grid, current, step = uniform_sweeps(U, I, points)
+    # пропуски внутри сетки (кривая короче других) не сглаживаются — заполняем краевыми значениями
+    current = np.where(np.isfinite(current), current, np.nanmax(current, axis=-1, keepdims=True))
+    second = savgol_filter(current, window, polyorder, deriv=2, axis=-1) / step[:, None] ** 2
+
+    if plasm_potential is None:
+        first = savgol_filter(current, window, polyorder, deriv=1, axis=-1)
+        plasm_potential = np.take_along_axis(grid, np.argmax(first, axis=-1)[:, None], axis=-1)[:, 0]
+    plasm_potential = np.broadcast_to(np.asarray(plasm_potential, dtype=np.float64), step.shape)
+
+    # ФРЭЭ в узлах сетки напряжения, м^-3·В^-1 (то же, что м^-3·эВ^-1)
+    energy = plasm_potential[:, None] - grid
+    retarding = energy > 0
+    energy = np.where(retarding, energy, 0)
+    f = (2 * electron_mass / (elementary_charge ** 2 * probe_area)
+         * np.sqrt(2 * elementary_charge * energy / electron_mass) * second)
+    f = np.where(retarding, f, 0)
+
+    # интегралы по энергии (шаг по энергии равен шагу сетки напряжения); отрицательные
+    # из-за шума значения учитываются, чтобы шум в хвосте не смещал <ε> вверх
+    concentration = np.sum(f, axis=-1) * step
+    mean_energy = np.sum(f * energy, axis=-1) * step / np.where(concentration > 0, concentration, np.nan)
+
+    if energies is None:
+        energies = np.linspace(0, 50, 256)
+    # энергия убывает вдоль строки — для интерполяции строки разворачиваются
+    eedf = batched_interp(np.broadcast_to(energies, (len(f), len(energies))),
+                          np.where(retarding, energy, np.nan)[:, ::-1], f[:, ::-1])
+    return {
+        "energy": energies,
+        "eedf": np.maximum(np.nan_to_num(eedf), 0),
+        "electron_concentration": concentration,
+        "electron_temperature": 2 / 3 * mean_energy,
+        "plasm_potential": plasm_potential,
+    }
+
+
+if __name__ == "__main__":
+    from lab6 import I1, I2, U1, U2
+    from probe import analyse_sweeps, stack_sweeps
+
+    U, I = stack_sweeps([(U1, I1), (U2, I2)])
+    knee = analyse_sweeps(U, I)["plasm_potential"]
+    result = druyvesteyn(U, I, plasm_potential=knee, window=31)
+    for row, title in enumerate(("без магнитного поля", "в магнитном поле")):
+        print(f"ВАХ {title}: n_e = {result['electron_concentration'][row]:.3e} м^-3, "
+              f"T_eff = {result['electron_temperature'][row]:.2f} эВ")
+
+    # модельные ВАХ с идеально острым изломом: сглаживание излома дает систематическое
+    # завышение T_eff и занижение n_e, убывающее с шагом сетки
+    U, I, truth = synthetic_sweeps(5000, points=2048, seed=0, noise=0.001)
+    started = time.perf_counter()
+    result = druyvesteyn(U, I, plasm_potential=truth["plasm_potential"], points=1024, window=7)
+    elapsed = time.perf_counter() - started
+    te = truth["electron_temperature"]
+    # концентрация максвелловской плазмы по электронному току насыщения
+    density = truth["electron_current"] / (
+        elementary_charge * DEFAULT_PROBE_AREA * np.sqrt(elementary_charge * te / (2 * np.pi * electron_mass)))
+    print(f"\nМодельные ВАХ: {len(U)} кривых за {elapsed:.3f} с ({len(U) / elapsed:.0f} кривых/с)")
+    print(f"  T_eff: медианная относительная ошибка "
+          f"{np.median(np.abs(result['electron_temperature'] / te - 1)) * 100:.1f} %")
+    print(f"  n_e: медианная относительная ошибка "
+          f"{np.median(np.abs(result['electron_concentration'] / density - 1)) * 100:.1f} %")
@@ -108,10 +108,11 @@ def plot_semilog(U, I, title, filename):
     plt.close()
 
 # ================== ПОСТРОЕНИЕ ГРАФИКОВ ==================
-plot_iv(U1, I1, 'ВАХ без магнитного поля', 'VAH_no_field.png')
-plot_iv(U2, I2, 'ВАХ в магнитном поле', 'VAH_with_field.png')
+if __name__ == "__main__":
+    plot_iv(U1, I1, 'ВАХ без магнитного поля', 'VAH_no_field.png')
+    plot_iv(U2, I2, 'ВАХ в магнитном поле', 'VAH_with_field.png')
 
-plot_semilog(U1, I1, 'Полулогарифмическая ВАХ без магнитного поля',
-             'VAH_semilog_no_field.png')
-plot_semilog(U2, I2, 'Полулогарифмическая ВАХ в магнитном поле',
-             'VAH_semilog_with_field.png')
+    plot_semilog(U1, I1, 'Полулогарифмическая ВАХ без магнитного поля',
+                 'VAH_semilog_no_field.png')
+    plot_semilog(U2, I2, 'Полулогарифмическая ВАХ в магнитном поле',
+                 'VAH_semilog_with_field.png')
@@ -0,0 +1,206 @@
+"""
+Пакетная обработка вольт-амперных характеристик (ВАХ) ленгмюровского зонда.
+
+Стопка из M ВАХ задается массивами U, I формы (M, P); кривые разной длины дополняются
+значениями NaN. Для всех кривых сразу определяются плавающий потенциал (нуль тока),
+ионный ток насыщения, излом ВАХ (потенциал плазмы) и электронный ток насыщения
+по двум прямым в полулогарифмическом масштабе, а также температура электронов по
+наклону переходного участка. Потенциал плазмы, температура и токи насыщения возвращаются
+под именами входных столбцов calculations.py (plasm_potential, electron_temperature,
+electron_current, ion_current), поэтому результат вместе с остальными входами
+(магнитное поле, времена столкновений, концентрация нейтралов) передается в
+compute_plasma_state без преобразований; лишний столбец floating_potential графом
+не используется.
+"""
+import time
+
+import numpy as np
+
+
+def stack_sweeps(sweeps):
+    """Стопка (U, I) формы (M, P) из списка пар массивов разной длины (дополняется NaN)"""
+    length = max(len(U) for U, _ in sweeps)
+    U = np.full((len(sweeps), length), np.nan)
+    I = np.full((len(sweeps), length), np.nan)
+    for row, (u, i) in enumerate(sweeps):
+        U[row, :len(u)] = u
+        I[row, :len(i)] = i
+    return U, I
+
+
+def sort_sweeps(U, I):
+    """Сортирует каждую ВАХ по напряжению (NaN остаются в конце строки)"""
+    U = np.atleast_2d(np.asarray(U, dtype=np.float64))
+    I = np.atleast_2d(np.asarray(I, dtype=np.float64))
+    order = np.argsort(U, axis=-1)
+    return np.take_along_axis(U, order, axis=-1), np.take_along_axis(I, order, axis=-1)
+
+
+def floating_potential(U, I):
+    """
+    Плавающий потенциал — напряжение последнего перехода тока через нуль снизу вверх
+    (линейная интерполяция между соседними точками). U, I отсортированы по U.
+    """
+    negative = I < 0
+    count = np.sum(np.isfinite(U), axis=-1)
+    # индекс последней точки с отрицательным током
+    last = I.shape[-1] - 1 - np.argmax(negative[:, ::-1], axis=-1)
+    last = np.minimum(last, count - 2)
+    rows = np.arange(len(U))
+    u0, u1 = U[rows, last], U[rows, last + 1]
+    i0, i1 = I[rows, last], I[rows, last + 1]
+    result = u0 + (u1 - u0) * (-i0) / (i1 - i0)
+    # нет перехода через нуль: ток везде одного знака
+    crossing = negative.any(axis=-1) & (I[rows, last + 1] >= 0)
+    return np.where(crossing, result, np.nan)
+
+
+def ion_saturation_current(U, I, fraction=0.2):
+    """
+    Ионный ток насыщения (модуль) — среднее отрицательного тока в нижней части
+    диапазона напряжений шириной fraction.
+    """
+    low = np.nanmin(U, axis=-1, keepdims=True)
+    high = np.nanmax(U, axis=-1, keepdims=True)
+    branch = (U <= low + fraction * (high - low)) & (I < 0)
+    total = np.where(branch, I, 0).sum(axis=-1)
+    return -total / np.maximum(branch.sum(axis=-1), 1)
+
+
+def _line_sums(t, z, w):
+    """Накопленные суммы для МНК-прямой z = a t + b по точкам с весом w (0 или 1)"""
+    return [np.cumsum(s, axis=-1) for s in (w, w * t, w * z, w * t * t, w * t * z, w * z * z)]
+
+
+def _line_fit(n, st, sz, stt, stz, szz):
+    """Наклон, свободный член и сумма квадратов остатков МНК-прямой по суммам"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dtt = stt - st * st / n
+        dtz = stz - st * sz / n
+        slope = dtz / dtt
+        intercept = (sz - slope * st) / n
+        residual = szz - sz * sz / n - slope * dtz
+    return slope, intercept, residual
+
+
+def _at_split(values, split, found):
+    """Значения в выбранной точке разбиения каждой строки (NaN, если разбиения нет)"""
+    return np.where(found, np.take_along_axis(values, split, axis=-1)[:, 0], np.nan)
+
+
+def knee_fit(U, I_electron, start, min_points=3):
+    """
+    Излом полулогарифмической ВАХ: разбиение точек с U >= start на переходный участок
+    и участок насыщения, при котором сумма квадратов остатков двух прямых ln I_e(U)
+    минимальна. Перебираются все разбиения сразу через накопленные суммы.
+
+    Возвращает (наклон и свободный член переходного участка, то же для насыщения,
+    напряжение точки пересечения прямых).
+    """
+    valid = (U >= start[:, None]) & (I_electron > 0) & np.isfinite(U)
+    w = valid.astype(np.float64)
+    t = np.where(valid, U, 0)
+    with np.errstate(divide="ignore"):
+        z = np.where(valid, np.log(np.where(valid, I_electron, 1)), 0)
+
+    left = _line_sums(t, z, w)
+    right = [s[:, -1:] - s for s in left]
+    a1, b1, r1 = _line_fit(*left)
+    a2, b2, r2 = _line_fit(*right)
+
+    enough = (left[0] >= min_points) & (right[0] >= min_points) & (a1 > 0)
+    cost = np.where(enough, r1 + r2, np.inf)
+    split = np.argmin(cost, axis=-1)[:, None]
+    found = np.isfinite(np.take_along_axis(cost, split, axis=-1))[:, 0]
+
+    a1, b1, a2, b2 = (_at_split(a, split, found) for a in (a1, b1, a2, b2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        knee = (b2 - b1) / (a1 - a2)
+    # прямые почти параллельны: излом — граница разбиения
+    boundary = _at_split(U, split, found)
+    outside = ~((knee >= start) & (knee <= np.nanmax(U, axis=-1)))
+    knee = np.where(outside, boundary, knee)
+    return (a1, b1), (a2, b2), knee
+
+
+def analyse_sweeps(U, I, ion_fraction=0.2, min_points=3):
+    """
+    Параметры плазмы по стопке ВАХ U, I формы (M, P) или (P,) (В, А).
+
+    Возвращает словарь массивов длины M:
+      "plasm_potential" — потенциал плазмы (излом ВАХ), В;
+      "floating_potential" — плавающий потенциал, В;
+      "electron_temperature" — температура электронов по наклону ln I_e, эВ;
+      "electron_current" — электронный ток насыщения, А;
+      "ion_current" — ионный ток насыщения, А.
+    Ключи plasm_potential, electron_temperature, electron_current и ion_current совпадают
+    с входными столбцами calculations.py.
+    Кривые, для которых величину определить нельзя, дают NaN.
+    """
+    U, I = sort_sweeps(U, I)
+    ion = ion_saturation_current(U, I, ion_fraction)
+    floating = floating_potential(U, I)
+    # электронный ток: измеренный ток за вычетом ионного тока насыщения
+    electron = I + ion[:, None]
+    start = np.where(np.isfinite(floating), floating, np.nanmin(U, axis=-1))
+    (a1, b1), _, knee = knee_fit(U, electron, start, min_points)
+    return {
+        "plasm_potential": knee,
+        "floating_potential": floating,
+        "electron_temperature": 1 / a1,
+        "electron_current": np.exp(a1 * knee + b1),
+        "ion_current": ion,
+    }
+
+
+def synthetic_sweeps(count, points=128, seed=None, noise=0.02):
+    """Модельные ВАХ с известными параметрами (для проверки и замеров скорости)"""
+    rng = np.random.default_rng(seed)
+    te = rng.uniform(2, 10, (count, 1))
+    vp = rng.uniform(-20, 40, (count, 1))
+    ion = rng.uniform(0.05, 0.5, (count, 1))
+    electron = ion * rng.uniform(50, 300, (count, 1))
+    U = np.linspace(-200, 150, points) + np.zeros((count, 1))
+    I = np.where(U < vp, electron * np.exp((U - vp) / te), electron) - ion
+    I *= 1 + noise * rng.standard_normal(I.shape)
+    truth = {"plasm_potential": vp[:, 0], "electron_temperature": te[:, 0],
+             "electron_current": electron[:, 0], "ion_current": ion[:, 0]}
+    return U, I, truth
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    from lab6 import I1, I2, U1, U2
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from calculations import INPUT_COLUMNS, MEASUREMENT_INPUTS, compute_plasma_state
+
+    U, I = stack_sweeps([(U1, I1), (U2, I2)])
+    result = analyse_sweeps(U, I)
+    for row, title in enumerate(("без магнитного поля", "в магнитном поле")):
+        print(f"ВАХ {title}:")
+        print(f"  плавающий потенциал: {result['floating_potential'][row]:.1f} В")
+        print(f"  потенциал плазмы: {result['plasm_potential'][row]:.1f} В")
+        print(f"  температура электронов: {result['electron_temperature'][row]:.2f} эВ")
+        print(f"  электронный ток насыщения: {result['electron_current'][row]:.3g} А")
+        print(f"  ионный ток насыщения: {result['ion_current'][row]:.3g} А")
+
+    # результат зонда — входные столбцы цепочки; недостающие столбцы берутся из
+    # первых измеренных точек
+    missing = [name for name in INPUT_COLUMNS if name not in result]
+    inputs = dict(result, **{name: MEASUREMENT_INPUTS[name][:len(U)] for name in missing})
+    state = compute_plasma_state(inputs, ["electron_concentration", "electron_hall_parameter"])
+    print(f"compute_plasma_state по результату зонда (из измерений: {', '.join(missing)}):")
+    for name, value in state.items():
+        print(f"  {name}: {value}")
+
+    U, I, truth = synthetic_sweeps(10000, seed=0)
+    started = time.perf_counter()
+    result = analyse_sweeps(U, I)
+    elapsed = time.perf_counter() - started
+    print(f"\nМодельные ВАХ: {len(U)} кривых за {elapsed:.3f} с ({len(U) / elapsed:.0f} кривых/с)")
+    for name, value in truth.items():
+        error = np.nanmedian(np.abs(result[name] / value - 1))
+        print(f"  {name}: медианная относительная ошибка {error * 100:.1f} %")
@@ -0,0 +1,197 @@
+"""
+Потоковая обработка отсчетов зонда во время работы двигателя.
+
+Отсчеты (U, I) поступают по одному в кольцевой буфер фиксированного размера. Полулогарифмическая
+прямая ln I = a U + b (как в plot_semilog из lab6.py) уточняется по накопленным суммам МНК:
+при поступлении отсчета его вклад добавляется, вклад вытесненного из буфера — вычитается,
+поэтому время обработки отсчета не зависит ни от размера буфера, ни от длительности записи.
+Чтобы ошибки округления не накапливались часами, суммы раз в recompute_every отсчетов
+пересчитываются по буферу (в среднем O(1) на отсчет).
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+
+class SemilogStream:
+    """
+    Кольцевой буфер отсчетов (U, I) на size точек с МНК-прямой ln I(U).
+
+    В прямую входят отсчеты с I > 0 и U в диапазоне u_range (переходный участок ВАХ).
+    """
+
+    def __init__(self, size=1024, u_range=(-math.inf, math.inf), recompute_every=None):
+        self.size = size
+        self.u_low, self.u_high = u_range
+        self.recompute_every = recompute_every or 16 * size
+        self.u = [0.0] * size
+        self.i = [0.0] * size
+        self.z = [0.0] * size
+        self.used = [False] * size
+        self.head = 0
+        self.count = 0
+        self.total = 0
+        self._since_recompute = 0
+        self.n = self.su = self.sz = self.suu = self.suz = 0.0
+
+    def push(self, u, i):
+        """Добавляет отсчет; самый старый отсчет вытесняется, когда буфер заполнен"""
+        head = self.head
+        if self.used[head]:
+            old_u, old_z = self.u[head], self.z[head]
+            self.n -= 1
+            self.su -= old_u
+            self.sz -= old_z
+            self.suu -= old_u * old_u
+            self.suz -= old_u * old_z
+        self.u[head] = u
+        self.i[head] = i
+        used = i > 0 and self.u_low <= u <= self.u_high
+        self.used[head] = used
+        if used:
+            z = math.log(i)
+            self.z[head] = z
+            self.n += 1
+            self.su += u
+            self.sz += z
+            self.suu += u * u
+            self.suz += u * z
+        self.head = head + 1 if head + 1 < self.size else 0
+        if self.count < self.size:
+            self.count += 1
+        self.total += 1
+        self._since_recompute += 1
+        if self._since_recompute >= self.recompute_every:
+            self.recompute()
+
+    def recompute(self):
+        """Пересчитывает суммы МНК по содержимому буфера"""
+        self.n = self.su = self.sz = self.suu = self.suz = 0.0
+        for u, z, used in zip(self.u, self.z, self.used):
+            if used:
+                self.n += 1
+                self.su += u
+                self.sz += z
+                self.suu += u * u
+                self.suz += u * z
+        self._since_recompute = 0
+
+    def fit(self):
+        """Наклон и свободный член прямой ln I = a U + b или None, если точек недостаточно"""
+        n = self.n
+        if n < 2:
+            return None
+        duu = self.suu - self.su * self.su / n
+        if duu <= 0:
+            return None
+        slope = (self.suz - self.su * self.sz / n) / duu
+        return slope, (self.sz - slope * self.su) / n
+
+    @property
+    def electron_temperature(self):
+        """Температура электронов 1/a по наклону прямой, эВ (NaN, если оценки нет)"""
+        line = self.fit()
+        if line is None or line[0] <= 0:
+            return math.nan
+        return 1 / line[0]
+
+    def snapshot(self):
+        """Отсчеты буфера (U, I) в порядке поступления в виде массивов"""
+        order = np.roll(np.arange(self.size), -self.head)[self.size - self.count:]
+        return np.asarray(self.u)[order], np.asarray(self.i)[order]
+
+
+def replay(U, I, rate=None, repeat=1):
+    """
+    Источник отсчетов по записанным массивам U, I: выдает пары (U, I) с частотой rate
+    отсчетов в секунду (без задержек при rate=None), повторяя запись repeat раз.
+    """
+    U = np.asarray(U, dtype=np.float64).tolist()
+    I = np.asarray(I, dtype=np.float64).tolist()
+    period = 1 / rate if rate else 0
+    started = time.perf_counter()
+    emitted = 0
+    for _ in range(repeat):
+        for u, i in zip(U, I):
+            if period:
+                delay = started + emitted * period - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield u, i
+            emitted += 1
+
+
+def measure_latency(stream, source, block=100000):
+    """
+    Подает отсчеты source в stream и замеряет время push и оценки Te на каждый отсчет.
+    Возвращает список (отсчетов, среднее, 99-й процентиль, максимум) по блокам в мкс.
+    """
+    clock = time.perf_counter_ns
+    report = []
+    samples = [0] * block
+    filled = 0
+    for u, i in source:
+        started = clock()
+        stream.push(u, i)
+        stream.electron_temperature
+        samples[filled] = clock() - started
+        filled += 1
+        if filled == block:
+            latency = np.asarray(samples) / 1000
+            report.append((stream.total, latency.mean(), np.percentile(latency, 99), latency.max()))
+            filled = 0
+    return report
+
+
+def live_plot(stream, source, every=50):
+    """Полулогарифмическая ВАХ и оценка Te, обновляемые по мере поступления отсчетов"""
+    import matplotlib.pyplot as plt
+
+    plt.ion()
+    fig, ax = plt.subplots(figsize=(9, 6))
+    points, = ax.plot([], [], 'o', label='Эксперимент')
+    line, = ax.plot([], [], linewidth=2.5, label='МНК')
+    ax.set_xlabel('Напряжение, подаваемое на зонд, В')
+    ax.set_ylabel('Логарифм тока')
+    ax.grid(True)
+    ax.legend()
+    for count, (u, i) in enumerate(source, start=1):
+        stream.push(u, i)
+        if count % every:
+            continue
+        U, I = stream.snapshot()
+        mask = I > 0
+        points.set_data(U[mask], np.log(I[mask]))
+        fit = stream.fit()
+        if fit is not None:
+            grid = np.array([U.min(), U.max()])
+            line.set_data(grid, fit[0] * grid + fit[1])
+        ax.set_title(f"T_e = {stream.electron_temperature:.2f} эВ")
+        ax.relim()
+        ax.autoscale_view()
+        plt.pause(0.001)
+    plt.ioff()
+    plt.show()
+
+
+if __name__ == "__main__":
+    from lab6 import I2, U2
+
+    parser = argparse.ArgumentParser(description="Потоковая обработка отсчетов зонда")
+    parser.add_argument("--rate", type=float, default=None, help="частота отсчетов, 1/с")
+    parser.add_argument("--samples", type=int, default=2 * 10 ** 6)
+    parser.add_argument("--plot", action="store_true", help="живой полулогарифмический график")
+    args = parser.parse_args()
+
+    order = np.argsort(U2)
+    repeat = max(1, args.samples // len(U2))
+    # переходный участок ВАХ в магнитном поле
+    stream = SemilogStream(size=256, u_range=(-56, -10))
+    if args.plot:
+        live_plot(stream, replay(U2[order], I2[order], rate=args.rate or 200, repeat=repeat), every=5)
+    else:
+        for total, mean, p99, worst in measure_latency(stream, replay(U2[order], I2[order], args.rate, repeat)):
+            print(f"{total:>9} отсчетов: среднее {mean:.2f} мкс, 99 % {p99:.2f} мкс, максимум {worst:.1f} мкс")
+        print(f"T_e = {stream.electron_temperature:.2f} эВ")
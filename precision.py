@@ -0,0 +1,80 @@
+"""
+Проверка расчета цепочки calculations.py с пониженной точностью (float32).
+
+Производные величины хранятся в float32, чувствительные к округлению узлы
+(calculations.FLOAT64_QUANTITIES) считаются в float64. Для каждой выходной величины
+находится максимальная относительная погрешность относительно расчета в float64
+по выборке точек из рабочей области разверток.
+"""
+import time
+
+import numpy as np
+
+from calculations import INPUT_COLUMNS, MEASUREMENT_INPUTS, QUANTITIES, compute_plasma_state
+
+# Границы рабочей области для входных столбцов; остальные столбцы берутся
+# в диапазоне измеренных значений с запасом в 2 раза
+ENVELOPE = {
+    "magnet_field": (5, 200),
+    "electron_temperature": (2, 10),
+    "plasm_potential": (50, 199.5),
+    "volume_flow": (0.3e-6, 1.0e-6),
+}
+
+
+def envelope_inputs(n, seed=0):
+    """N случайных точек рабочей области (логарифмически равномерно по каждому столбцу)"""
+    rng = np.random.default_rng(seed)
+    inputs = {}
+    for name in INPUT_COLUMNS + ("volume_flow",):
+        if name in ENVELOPE:
+            low, high = ENVELOPE[name]
+        else:
+            measured = np.asarray(MEASUREMENT_INPUTS[name])
+            low, high = measured.min() / 2, measured.max() * 2
+        inputs[name] = np.exp(rng.uniform(np.log(low), np.log(high), n))
+    return inputs
+
+
+def relative_errors(inputs, outputs=None, dtype=np.float32, chunk=1 << 20):
+    """
+    Максимальная по точкам относительная погрешность каждой величины outputs при расчете
+    с типом dtype относительно float64. Точки обрабатываются частями по chunk.
+    """
+    if outputs is None:
+        outputs = list(QUANTITIES)
+    n = max(np.size(value) for value in inputs.values())
+    errors = dict.fromkeys(outputs, 0.0)
+    for start in range(0, n, chunk):
+        part = {name: value[start:start + chunk] if np.ndim(value) else value for name, value in inputs.items()}
+        reference = compute_plasma_state(part, outputs)
+        reduced = compute_plasma_state(part, outputs, dtype)
+        for name in outputs:
+            exact = np.asarray(reference[name], dtype=np.float64)
+            scale = np.where(exact == 0, 1, np.abs(exact))
+            error = np.abs(np.asarray(reduced[name], dtype=np.float64) - exact) / scale
+            errors[name] = max(errors[name], float(np.max(error)))
+    return errors
+
+
+if __name__ == "__main__":
+    import tracemalloc
+
+    from sweep import SWEEP_OUTPUTS
+
+    inputs = envelope_inputs(10 ** 6)
+    errors = relative_errors(inputs)
+    print(f"Максимальная относительная погрешность float32 относительно float64 ({10 ** 6} точек):")
+    for name, error in sorted(errors.items(), key=lambda item: -item[1]):
+        print(f"  {name:<45} {error:.2e}")
+
+    print("Величины разверток:")
+    for dtype in (np.float64, np.float32):
+        started = time.perf_counter()
+        compute_plasma_state(inputs, SWEEP_OUTPUTS, dtype)
+        elapsed = time.perf_counter() - started
+        tracemalloc.start()
+        compute_plasma_state(inputs, SWEEP_OUTPUTS, dtype)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {np.dtype(dtype).name}: {elapsed * 1e3:.1f} мс, пиковая память {peak / 2 ** 20:.1f} МБ")
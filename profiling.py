@@ -0,0 +1,224 @@
+"""
+Профилирование этапов расчета: время, выделенная память и число элементов по именованным этапам.
+
+Инструментированный код оборачивает этапы в stage("имя"). Пока профилировщик не включен,
+stage возвращает общий пустой контекст и почти ничего не стоит. Профилировщик включается
+блоком with Profiler() as profiler: ... и собирает записи этапов (в том числе вложенных):
+время начала и длительность, прирост и пик памяти NumPy/Python по tracemalloc и число
+элементов результата. Итоги выводятся таблицей summary() или сохраняются в формате
+Chrome trace (write_trace, просмотр в chrome://tracing или ui.perfetto.dev).
+
+Этапы, выполняемые в других процессах (пул разверток и отрисовки), не записываются.
+Модуль импортируется из calculations.py, поэтому json, threading и tracemalloc
+загружаются только при включении профилировщика.
+"""
+import contextlib
+import os
+import time
+
+import numpy as np
+
+# Включенный профилировщик (None — профилирование выключено)
+_active = None
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def active():
+    """Включенный профилировщик или None"""
+    return _active
+
+
+def stage(name, category="", elements=None):
+    """Контекст этапа name; без включенного профилировщика ничего не делает"""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name, category, elements)
+
+
+def element_count(value):
+    """Число элементов результата (1 для скаляров и объектов без размера)"""
+    size = getattr(value, "size", None)
+    return int(size) if isinstance(size, (int, np.integer)) else 1
+
+
+class StageRecord:
+    """Запись одного этапа; elements можно задать внутри блока with"""
+
+    __slots__ = ("name", "category", "elements", "start", "duration", "allocated", "peak", "depth")
+
+    def __init__(self, name, category, elements, depth):
+        self.name = name
+        self.category = category
+        self.elements = elements
+        self.depth = depth
+        self.start = self.duration = 0
+        self.allocated = self.peak = 0
+
+
+class _Stage:
+    def __init__(self, profiler, record):
+        self.profiler = profiler
+        self.record = record
+
+    def __enter__(self):
+        import tracemalloc
+
+        profiler = self.profiler
+        if profiler.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # пик внешнего этапа до сброса счетчика для этого этапа
+            if profiler._stack:
+                outer = profiler._stack[-1]
+                outer[2] = max(outer[2], peak)
+            tracemalloc.reset_peak()
+            profiler._stack.append([self.record, current, current])
+        else:
+            profiler._stack.append([self.record, 0, 0])
+        self.record.start = time.perf_counter_ns()
+        return self.record
+
+    def __exit__(self, *exc):
+        import tracemalloc
+
+        end = time.perf_counter_ns()
+        profiler = self.profiler
+        record, before, peak = profiler._stack.pop()
+        record.duration = end - record.start
+        if profiler.memory:
+            current, traced_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, traced_peak)
+            record.allocated = current - before
+            record.peak = peak - before
+            if profiler._stack:
+                outer = profiler._stack[-1]
+                outer[2] = max(outer[2], peak)
+        profiler.records.append(record)
+        return False
+
+
+class Profiler:
+    """
+    Сборщик записей этапов. memory=True включает учет памяти через tracemalloc
+    (точнее, но заметно медленнее на мелких этапах).
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.records = []
+        self._stack = []
+        self._started_tracemalloc = False
+        self._previous = None
+        self._origin = time.perf_counter_ns()
+
+    def stage(self, name, category="", elements=None):
+        return _Stage(self, StageRecord(name, category, elements, len(self._stack)))
+
+    def __enter__(self):
+        global _active
+        import tracemalloc
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._previous, _active = _active, self
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        import tracemalloc
+
+        _active = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    def totals(self, by="name"):
+        """Итоги по имени этапа (by="name") или категории (by="category"), по убыванию времени"""
+        totals = {}
+        for record in self.records:
+            key = getattr(record, by) or record.name
+            total = totals.setdefault(key, {"calls": 0, "seconds": 0.0, "allocated": 0,
+                                            "peak": 0, "elements": 0})
+            total["calls"] += 1
+            total["seconds"] += record.duration / 1e9
+            total["allocated"] += record.allocated
+            total["peak"] = max(total["peak"], record.peak)
+            total["elements"] += record.elements or 0
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["seconds"]))
+
+    def summary(self, by="name", limit=None):
+        """Текстовая таблица итогов по этапам"""
+        header = (f"{'Этап':<45} {'вызовов':>8} {'время, мс':>10} {'выделено, МБ':>13} "
+                  f"{'пик, МБ':>9} {'элементов':>11} {'элем./с':>10}")
+        lines = [header, "-" * len(header)]
+        for key, total in list(self.totals(by).items())[:limit]:
+            rate = total["elements"] / total["seconds"] if total["seconds"] and total["elements"] else 0
+            lines.append(f"{key:<45} {total['calls']:>8} {total['seconds'] * 1e3:>10.3f} "
+                         f"{total['allocated'] / 2 ** 20:>13.2f} {total['peak'] / 2 ** 20:>9.2f} "
+                         f"{total['elements']:>11} {rate:>10.3g}")
+        return "\n".join(lines)
+
+    def trace_events(self):
+        """События Chrome trace (полные события "X", время в мкс)"""
+        import threading
+
+        pid, tid = os.getpid(), threading.get_ident()
+        events = []
+        for record in sorted(self.records, key=lambda r: (r.start, r.depth)):
+            events.append({
+                "name": record.name,
+                "cat": record.category or "stage",
+                "ph": "X",
+                "ts": (record.start - self._origin) / 1e3,
+                "dur": record.duration / 1e3,
+                "pid": pid,
+                "tid": tid,
+                "args": {"allocated_bytes": record.allocated, "peak_bytes": record.peak,
+                         "elements": record.elements},
+            })
+        return events
+
+    def write_trace(self, path):
+        """Сохраняет записи в формате Chrome trace JSON"""
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        return path
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+    import profiling
+    from calculations import compute_plasma_state
+    from common import make_inputs
+
+    parser = argparse.ArgumentParser(description="Профиль этапов цепочки calculations.py")
+    parser.add_argument("--n", type=int, default=10 ** 6, help="число точек")
+    parser.add_argument("--trace", default="plasma_trace.json", help="файл Chrome trace")
+    parser.add_argument("--no-memory", action="store_true", help="без учета памяти (tracemalloc)")
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.n)
+
+    started = time.perf_counter()
+    compute_plasma_state(inputs)
+    plain = time.perf_counter() - started
+
+    # профилировщик того же модуля, что импортирован в calculations
+    with profiling.Profiler(memory=not args.no_memory) as profiler:
+        with profiling.stage("compute_plasma_state", "calculations", args.n):
+            compute_plasma_state(inputs)
+
+    print(profiler.summary(by="category"))
+    print()
+    print(profiler.summary(limit=15))
+    total = profiler.totals()["compute_plasma_state"]["seconds"]
+    print(f"\nБез профилирования {plain * 1e3:.1f} мс, с профилированием {total * 1e3:.1f} мс")
+    print(f"Chrome trace: {profiler.write_trace(args.trace)}")
@@ -0,0 +1,219 @@
+"""
+Бинарное столбцовое хранилище результатов расчетов.
+
+Хранилище — каталог, в котором каждый столбец лежит в отдельном файле <имя>.bin
+(сырые числа в порядке байтов машины), а schema.json описывает имена, типы, длины,
+единицы измерения и русские подписи столбцов, скалярные величины и атрибуты.
+Столбцы можно дописывать порциями и читать по отдельности через np.memmap, не
+разбирая остальные.
+"""
+import json
+import os
+
+import numpy as np
+
+# Подписи и единицы измерения величин (как в текстовом отчете)
+COLUMN_INFO = {
+    "distances": ("Расстояния", "мм"),
+    "plasm_potential": ("Потенциал плазмы", "В"),
+    "magnet_field": ("Магнитное поле", "Гс"),
+    "magnet_field_tesla": ("Магнитное поле", "Тл"),
+    "measured_electron_current": ("Измеренный ток электронов", "А"),
+    "measured_ion_current": ("Измеренный ток ионов", "А"),
+    "electron_current": ("Ток электронов", "А"),
+    "ion_current": ("Ток ионов", "А"),
+    "electron_current_density": ("Плотность тока электронов", "А/м²"),
+    "ion_current_density": ("Плотность тока ионов", "А/м²"),
+    "electron_temperature": ("Температура электронов", "эВ"),
+    "ion_temperature": ("Температура ионов", "эВ"),
+    "elastic_en_time": ("Время упругого взаимодействия", "с"),
+    "nonelastic_en_time": ("Время неупругого взаимодействия", "с"),
+    "neutral_temperature": ("Температура нейтралов", "К"),
+    "kinetic_diameter_krypton": ("Кинетический диаметр криптона", "м"),
+    "volume_flow": ("Объемный расход криптона", "м³/с"),
+    "krypton_density": ("Плотность криптона", "кг/м³"),
+    "mass_flow": ("Массовый расход", "кг/с"),
+    "neutral_mass_flow": ("Массовый расход нейтралов", "кг/с"),
+    "k": ("Постоянная Больцмана", "Дж/К"),
+    "electron_mass": ("Масса электрона", "кг"),
+    "elementary_charge": ("Элементарный заряд", "Кл"),
+    "dielectric_constant": ("Диэлектрическая постоянная", "Ф/м"),
+    "krypton_mass": ("Масса криптона", "кг"),
+    "krypton_atom_radius": ("Радиус атома криптона", "м"),
+    "krypton_ionisation_potential": ("Потенциал ионизации криптона", "эВ"),
+    "a0": ("Боровский радиус", "м"),
+    "square_of_channel": ("Площадь канала", "м²"),
+    "electron_velocity": ("Скорость электронов", "м/с"),
+    "ion_velocity": ("Скорость ионов", "м/с"),
+    "neutral_velocity": ("Скорость нейтралов", "м/с"),
+    "v_perp_e": ("Поперечная скорость электронов", "м/с"),
+    "v_perp_i": ("Поперечная скорость ионов", "м/с"),
+    "electron_concentration": ("Концентрация электронов", "м^-3"),
+    "ion_concentration": ("Концентрация ионов", "м^-3"),
+    "neutral_concentration": ("Концентрация нейтралов", "м^-3"),
+    "debye_radius": ("Радиус Дебая", "м"),
+    "number_of_particles_in_debye_sphere": ("Число частиц в сфере Дебая", ""),
+    "plasm_frequency": ("Плазменная частота", "рад/с"),
+    "b_min": ("Минимальный прицельный параметр", "м"),
+    "electron_qoulon_logarithm": ("Кулоновский Логарифм электрон", ""),
+    "electron_cycle_frequency": ("Циклотронная частота электронов", "рад/с"),
+    "ion_cycle_frequency": ("Циклотронная частота ионов", "рад/с"),
+    "electron_larmor_radius": ("Радиус Лармора электронов", "м"),
+    "ion_larmor_radius": ("Радиус Лармора ионов", "м"),
+    "alpha": ("Поляризуемость атома", "м³"),
+    "relative_energy": ("Относительная энергия иона и атома", "эВ"),
+    "neutral_neutral_collision_cross_section": ("Сечение столкновения нейтрал-нейтрал", "м^2"),
+    "qoulon_collision_cross_section_electron": ("Сечение кулоновского столкновения для электронов", "м^2"),
+    "transport_cross_section_ions": ("Транспортное сечение ионов", "м^2"),
+    "recharge_cross_section": ("Сечение перезарядки", "м^2"),
+    "electron_electron_collision_frequency": ("Частота столкновений электрон-электрон", "с^-1"),
+    "electron_ion_collision_frequency": ("Частота столкновений электрон-ион", "с^-1"),
+    "electron_neutral_collision_frequency": ("Частота столкновений электрон-нейтрал", "с^-1"),
+    "overall_electron_collision_frequency": ("Общая частота столкновений электронов", "с^-1"),
+    "ion_ion_collision_frequency": ("Частота столкновений ион-ион", "с^-1"),
+    "ion_neutral_collision_frequency": ("Частота столкновений ион-нейтрал", "с^-1"),
+    "overall_ion_collision_frequency": ("Общая частота столкновений ионов", "с^-1"),
+    "neutral_neutral_collision_frequency": ("Частота столкновений нейтрал-нейтрал", "с^-1"),
+    "overall_neutral_collision_frequency": ("Общая частота столкновений нейтралов", "с^-1"),
+    "electron_free_path": ("Длина свободного пробега электронов", "м"),
+    "ion_free_path": ("Длина свободного пробега ионов", "м"),
+    "neutral_free_path": ("Длина свободного пробега нейтралов", "м"),
+    "electron_hall_parameter": ("Параметр Холла для электронов", ""),
+    "ion_hall_parameter": ("Параметр Холла для ионов", ""),
+    "electric_conductivity_longitudal": ("Электропроводность вдоль магнитного поля", "См/м"),
+    "electric_conductivity_transversal": ("Электропроводность поперек магнитного поля", "См/м"),
+    "thrust": ("Тяга", "Н"),
+    "nu_thrust": ("Тяговый КПД", ""),
+    "electric_field": ("Напряженность электрического поля", "В/м"),
+    "grad_electron_concentration": ("Градиент концентрации электронов", "м^-4"),
+    "grad_neutral_concentration": ("Градиент концентрации нейтралов", "м^-4"),
+    "grad_magnet_field": ("Градиент магнитного поля", "Гс/м"),
+    "grad_electron_temperature": ("Градиент температуры электронов", "эВ/м"),
+}
+
+
+def column_label(name):
+    """Подпись величины с единицами измерения, например «Радиус Дебая (м)»"""
+    label, unit = COLUMN_INFO.get(name, (name, ""))
+    return f"{label} ({unit})" if unit else label
+
+
+class ColumnStore:
+    """
+    Столбцовое хранилище в каталоге directory.
+
+    mode: "r" — только чтение, "a" — чтение и дозапись (каталог создается при
+    необходимости), "w" — новое пустое хранилище (существующие столбцы удаляются).
+    """
+
+    def __init__(self, directory, mode="r"):
+        self.directory = directory
+        self.mode = mode
+        self.schema = {"version": 1, "columns": {}, "scalars": {}, "attrs": {}}
+        schema_path = os.path.join(directory, "schema.json")
+        if mode == "w":
+            os.makedirs(directory, exist_ok=True)
+            for name in os.listdir(directory):
+                if name.endswith(".bin"):
+                    os.remove(os.path.join(directory, name))
+            self.flush()
+        elif os.path.exists(schema_path):
+            with open(schema_path, encoding="utf-8") as f:
+                self.schema = json.load(f)
+        elif mode == "a":
+            os.makedirs(directory, exist_ok=True)
+            self.flush()
+        else:
+            raise FileNotFoundError(f"Нет хранилища результатов: {directory}")
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _describe(self, name, dtype, length):
+        label, unit = COLUMN_INFO.get(name, (name, ""))
+        self.schema["columns"][name] = {"dtype": np.dtype(dtype).str, "length": int(length),
+                                        "unit": unit, "label": label}
+
+    def _check_writable(self):
+        if self.mode == "r":
+            raise ValueError("Хранилище открыто только для чтения")
+
+    @property
+    def columns(self):
+        return list(self.schema["columns"])
+
+    @property
+    def scalars(self):
+        return {name: info["value"] for name, info in self.schema["scalars"].items()}
+
+    @property
+    def attrs(self):
+        return self.schema["attrs"]
+
+    def __contains__(self, name):
+        return name in self.schema["columns"] or name in self.schema["scalars"]
+
+    def __getitem__(self, name):
+        if name in self.schema["scalars"]:
+            return self.schema["scalars"][name]["value"]
+        return self.column(name)
+
+    def column(self, name, mode="r"):
+        """Столбец name как np.memmap (mode "r" или "r+"), без чтения остальных столбцов"""
+        info = self.schema["columns"][name]
+        if info["length"] == 0:
+            return np.empty(0, dtype=info["dtype"])
+        return np.memmap(self._path(name), dtype=info["dtype"], mode=mode, shape=(info["length"],))
+
+    def append(self, columns):
+        """Дописывает порцию одномерных столбцов в конец (новые столбцы создаются)"""
+        self._check_writable()
+        for name, value in columns.items():
+            value = np.ascontiguousarray(value)
+            info = self.schema["columns"].get(name)
+            if info is None:
+                self._describe(name, value.dtype, 0)
+                info = self.schema["columns"][name]
+            elif np.dtype(info["dtype"]) != value.dtype:
+                value = value.astype(info["dtype"])
+            with open(self._path(name), "ab") as f:
+                f.write(value.ravel().tobytes())
+            info["length"] += value.size
+        self.flush()
+
+    def allocate(self, name, length, dtype=np.float64):
+        """Создает столбец заданной длины и возвращает его np.memmap для записи"""
+        self._check_writable()
+        self._describe(name, dtype, length)
+        with open(self._path(name), "wb") as f:
+            f.truncate(int(length) * np.dtype(dtype).itemsize)
+        self.flush()
+        return self.column(name, mode="r+")
+
+    def set_scalar(self, name, value):
+        """Сохраняет скалярную величину в схеме"""
+        self._check_writable()
+        label, unit = COLUMN_INFO.get(name, (name, ""))
+        self.schema["scalars"][name] = {"value": np.asarray(value).item(), "unit": unit, "label": label}
+
+    def flush(self):
+        """Атомарно записывает schema.json"""
+        if self.mode == "r":
+            return
+        path = os.path.join(self.directory, "schema.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.schema, f, ensure_ascii=False, indent=2)
+        os.replace(path + ".tmp", path)
+
+
+def save_values(directory, values):
+    """Записывает словарь величин (массивы — столбцами, скаляры — в схему) в новое хранилище"""
+    store = ColumnStore(directory, mode="w")
+    for name, value in values.items():
+        value = np.asarray(value)
+        if value.ndim == 0:
+            store.set_scalar(name, value)
+        else:
+            store.append({name: value})
+    store.flush()
+    return store
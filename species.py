@@ -0,0 +1,85 @@
+"""
+Сравнение рабочих газов СПД: криптон, ксенон и аргон в одном векторном проходе.
+
+Свойства газа — входы графа calculations.py (calculations.SPECIES_INPUTS). Для S газов
+они подаются столбцами формы (S, 1), а данные рабочих точек — формы (N,), поэтому по
+правилам broadcasting вся цепочка считается сразу для всех сочетаний газ × точка
+и каждая величина получается массивом формы (S, N).
+"""
+import numpy as np
+
+from calculations import MEASUREMENT_INPUTS, QUANTITIES, SPECIES_INPUTS, compute_plasma_state
+
+atomic_mass_unit = 1.66e-27  # кг (как для криптона в calculations.py)
+
+# Свойства газов. Радиус атома — для поляризуемости α = (r/0.62)³ (для криптона значение модели
+# 198 пм, для ксенона и аргона — ван-дер-ваальсовы радиусы); плотность — при 0 °C и 1 атм
+SPECIES = {
+    "Kr": {
+        "atom_mass": 83.798 * atomic_mass_unit,
+        "atom_radius": 198e-12,
+        "ionisation_potential": 13.99,
+        "kinetic_diameter": 360e-12,
+        "gas_density": 3.749,
+    },
+    "Xe": {
+        "atom_mass": 131.293 * atomic_mass_unit,
+        "atom_radius": 216e-12,
+        "ionisation_potential": 12.13,
+        "kinetic_diameter": 396e-12,
+        "gas_density": 5.894,
+    },
+    "Ar": {
+        "atom_mass": 39.948 * atomic_mass_unit,
+        "atom_radius": 188e-12,
+        "ionisation_potential": 15.76,
+        "kinetic_diameter": 340e-12,
+        "gas_density": 1.784,
+    },
+}
+
+
+def species_columns(species=tuple(SPECIES)):
+    """Столбцы свойств газов species формы (S, 1) для broadcasting с точками (N,)"""
+    return {name: np.array([SPECIES[gas][name] for gas in species], dtype=np.float64)[:, None]
+            for name in SPECIES_INPUTS}
+
+
+def compute_species_state(inputs, species=tuple(SPECIES), outputs=None, dtype=np.float64):
+    """
+    Расчет величин outputs для всех газов species и всех точек inputs за один проход.
+
+    inputs — столбцы рабочих точек формы (N,) как для compute_plasma_state (свойства газа
+    в них не задаются). Возвращает словарь массивов формы (S, N) в порядке species;
+    величины, не зависящие от точки (например, сечение нейтрал-нейтрал), тоже
+    растягиваются до (S, N) без копирования.
+    """
+    columns = dict(inputs)
+    columns.update(species_columns(species))
+    if outputs is None:
+        outputs = list(QUANTITIES)
+    state = compute_plasma_state(columns, outputs, dtype)
+    shape = np.broadcast_shapes(*(np.shape(value) for value in columns.values()))
+    return {name: np.broadcast_to(value, shape) for name, value in state.items()}
+
+
+if __name__ == "__main__":
+    import time
+
+    from calculations import distances
+
+    state = compute_species_state(MEASUREMENT_INPUTS)
+    for name in ("ion_velocity", "ion_concentration", "ion_hall_parameter", "electric_conductivity_transversal",
+                 "thrust"):
+        print(f"{name}:")
+        for gas, row in zip(SPECIES, state[name]):
+            print(f"  {gas}: " + ", ".join(f"{d} мм {value:.3e}" for d, value in zip(distances, row)))
+
+    rng = np.random.default_rng(0)
+    n = 10 ** 6
+    index = rng.integers(0, 3, n)
+    inputs = {name: value[index] for name, value in MEASUREMENT_INPUTS.items()}
+    started = time.perf_counter()
+    compute_species_state(inputs)
+    elapsed = time.perf_counter() - started
+    print(f"{len(SPECIES)} газа × {n} точек: {elapsed * 1e3:.1f} мс")
@@ -0,0 +1,166 @@
+import multiprocessing
+import multiprocessing.util
+import os
+import time
+
+import numpy as np
+
+from calculations import compute_plasma_state
+from profiling import stage
+from results_store import ColumnStore
+
+# Оси развертки рабочей области СПД (в порядке вложенности, последняя меняется быстрее всех)
+SWEEP_AXES = ("magnet_field", "electron_temperature", "plasm_potential", "volume_flow")
+
+# Величины, которые по умолчанию сохраняются для каждой точки сетки
+SWEEP_OUTPUTS = (
+    "electron_hall_parameter",
+    "ion_hall_parameter",
+    "electric_conductivity_transversal",
+    "thrust",
+    "nu_thrust",
+)
+
+# Оценка памяти на одну точку: входные столбцы, ~50 промежуточных массивов и временные
+BYTES_PER_POINT = 64 * 8
+
+
+def chunk_size_for_memory(max_memory_mb, dtype=np.float64):
+    """Число точек в части развертки, при котором расчет укладывается в max_memory_mb мегабайт"""
+    # входные столбцы и номера точек остаются 8-байтовыми при любом dtype
+    per_point = BYTES_PER_POINT * (1 + np.dtype(dtype).itemsize / 8) / 2
+    return max(1, int(max_memory_mb * 2 ** 20 // per_point))
+
+
+def grid_chunk(axes, start, stop):
+    """Столбцы входных данных для точек декартовой сетки с плоскими номерами [start, stop)"""
+    names = list(axes)
+    values = [np.asarray(axes[name], dtype=np.float64) for name in names]
+    shape = tuple(len(v) for v in values)
+    index = np.unravel_index(np.arange(start, stop), shape)
+    return {name: v[i] for name, v, i in zip(names, values, index)}
+
+
+def compute_chunk(axes, base, start, stop, outputs=SWEEP_OUTPUTS, dtype=np.float64):
+    """Расчет величин outputs для точек сетки с плоскими номерами [start, stop)"""
+    inputs = dict(base)
+    inputs.update(grid_chunk(axes, start, stop))
+    return compute_plasma_state(inputs, outputs, dtype)
+
+
+# Состояние процесса-исполнителя: оси, базовые входы и открытые на запись выходные массивы
+_worker = {}
+
+
+def _init_worker(axes, base, out_dir, outputs, dtype=np.float64):
+    _worker["axes"] = axes
+    _worker["base"] = base
+    _worker["outputs"] = outputs
+    _worker["dtype"] = dtype
+    store = ColumnStore(out_dir)
+    _worker["results"] = {name: store.column(name, mode="r+") for name in outputs}
+    if multiprocessing.parent_process() is not None:
+        # процесс пула: выходные файлы сбрасываются на диск один раз, при его завершении
+        multiprocessing.util.Finalize(None, _flush_worker, exitpriority=10)
+
+
+def _flush_worker():
+    for result in _worker.get("results", {}).values():
+        result.flush()
+
+
+def _run_chunk(bounds):
+    """Считает часть сетки и пишет ее прямо в отображенные в память выходные файлы"""
+    start, stop = bounds
+    with stage("compute_chunk", "sweep", stop - start):
+        state = compute_chunk(_worker["axes"], _worker["base"], start, stop, _worker["outputs"],
+                              _worker["dtype"])
+    with stage("write_chunk", "output", stop - start):
+        for name, result in _worker["results"].items():
+            result[start:stop] = state[name]
+    return stop - start
+
+
+def run_sweep(axes, base, out_dir, outputs=SWEEP_OUTPUTS, max_memory_mb=256, workers=1, verbose=True,
+              dtype=np.float64):
+    """
+    Расчет цепочки calculations.py на декартовой сетке по осям axes частями фиксированного размера.
+
+    axes — словарь {имя входного столбца: значения по оси}; base — значения остальных
+    входных столбцов (скаляры). Результаты пишутся в столбцовое хранилище out_dir
+    (results_store.ColumnStore) столбцами длины prod(len(ось)) в порядке
+    np.ravel_multi_index; оси и форма сетки сохраняются в атрибутах хранилища.
+    Пиковая память ограничивается параметром max_memory_mb (суммарно на все процессы).
+    При workers > 1 части сетки считаются в пуле процессов, каждый процесс пишет
+    свои части напрямую в файлы через np.memmap, результаты в пул не возвращаются.
+    Бюджет памяти делится между процессами, поэтому границы частей зависят от workers;
+    расчет поэлементный, и результат от разбиения на части не зависит (побитово).
+    dtype=np.float32 считает цепочку с пониженной точностью (calculations.compute_plasma_state)
+    и хранит столбцы в float32: вдвое меньше места на диске и больше точек в части.
+    """
+    shape = tuple(len(np.asarray(v)) for v in axes.values())
+    total = int(np.prod(shape))
+    chunk = chunk_size_for_memory(max_memory_mb / max(1, workers), dtype)
+
+    store = ColumnStore(out_dir, mode="w")
+    store.attrs.update({
+        "axes": {name: np.asarray(v, dtype=np.float64).tolist() for name, v in axes.items()},
+        "shape": list(shape),
+        "base": {name: float(v) for name, v in base.items()},
+    })
+    for name in outputs:
+        store.allocate(name, total, dtype)
+    store.flush()
+
+    bounds = [(start, min(start + chunk, total)) for start in range(0, total, chunk)]
+    initargs = (axes, base, out_dir, outputs, dtype)
+
+    started = time.perf_counter()
+    done = 0
+    if workers > 1:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=initargs)
+        finished = pool.imap_unordered(_run_chunk, bounds)
+    else:
+        pool = None
+        _init_worker(*initargs)
+        finished = map(_run_chunk, bounds)
+    try:
+        for points in finished:
+            done += points
+            if verbose:
+                elapsed = time.perf_counter() - started
+                print(f"Развертка: {done}/{total} точек ({100 * done / total:.1f} %), "
+                      f"{done / elapsed:.3e} точек/с")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            _flush_worker()
+            _worker.clear()
+
+    elapsed = time.perf_counter() - started
+    return {"points": total, "seconds": elapsed, "points_per_second": total / elapsed if elapsed else float("inf")}
+
+
+if __name__ == "__main__":
+    summary = run_sweep(
+        axes={
+            "magnet_field": np.linspace(5, 200, 40),
+            "electron_temperature": np.linspace(2, 10, 40),
+            "plasm_potential": np.linspace(50, 195, 40),
+            "volume_flow": np.linspace(0.3e-6, 1.0e-6, 40),
+        },
+        base={
+            "electron_current": 0.5,
+            "ion_current": 2.19,
+            "elastic_en_time": 1.84e-7,
+            "nonelastic_en_time": 2.44e-6,
+            "neutral_concentration": 2.84e18,
+        },
+        out_dir="sweep_results",
+        max_memory_mb=64,
+        workers=os.cpu_count() or 1,
+    )
+    print(f"Готово: {summary['points']} точек за {summary['seconds']:.2f} с "
+          f"({summary['points_per_second']:.3e} точек/с)")
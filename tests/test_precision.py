@@ -0,0 +1,38 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from calculations import INPUT_COLUMNS, MEASUREMENT_INPUTS, QUANTITIES
+from precision import ENVELOPE, envelope_inputs, relative_errors
+
+# Бюджет относительной погрешности float32 для всех величин графа
+# (измеренная погрешность ≈6e-7; без calculations.FLOAT64_QUANTITIES она 2e-6…4e-5)
+BUDGET = 1e-6
+
+
+def _corner_inputs():
+    """Все углы рабочей области: каждый столбец на нижней или верхней границе"""
+    bounds = {}
+    for name in INPUT_COLUMNS + ("volume_flow",):
+        if name in ENVELOPE:
+            bounds[name] = ENVELOPE[name]
+        else:
+            measured = np.asarray(MEASUREMENT_INPUTS[name])
+            bounds[name] = (measured.min() / 2, measured.max() * 2)
+    corners = np.array(list(itertools.product((0, 1), repeat=len(bounds))))
+    return {name: np.take(bounds[name], corners[:, i]) for i, name in enumerate(bounds)}
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_float32_error_within_budget_over_envelope(seed):
+    errors = relative_errors(envelope_inputs(10 ** 5, seed))
+    assert set(errors) == set(QUANTITIES)
+    over = {name: error for name, error in errors.items() if not error < BUDGET}
+    assert not over
+
+
+def test_float32_error_within_budget_at_envelope_corners():
+    errors = relative_errors(_corner_inputs())
+    over = {name: error for name, error in errors.items() if not error < BUDGET}
+    assert not over
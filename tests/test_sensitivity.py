@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from calculations import MEASUREMENT_INPUTS
+from precision import envelope_inputs
+from sensitivity import SENSITIVITY_OUTPUTS, check_jacobian
+
+# Центральные разности с шагом 1e-6 дают логарифмические производные с ошибкой ~1e-5,
+# ошибка в производной узла графа дает расхождение порядка единицы
+TOLERANCE = 1e-4
+
+
+@pytest.mark.parametrize("point", range(len(MEASUREMENT_INPUTS["magnet_field"])))
+def test_jacobian_matches_finite_differences_at_measurement_points(point):
+    inputs = {name: np.asarray(value)[point:point + 1] for name, value in MEASUREMENT_INPUTS.items()}
+    errors = check_jacobian(inputs)
+    assert set(errors) == set(SENSITIVITY_OUTPUTS)
+    for name, error in errors.items():
+        assert error < TOLERANCE, name
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_jacobian_matches_finite_differences_over_envelope(seed):
+    errors = check_jacobian(envelope_inputs(200, seed))
+    for name, error in errors.items():
+        assert error < TOLERANCE, name
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from results_store import ColumnStore
+from sweep import SWEEP_OUTPUTS, run_sweep
+
+AXES = {
+    "magnet_field": np.linspace(5, 200, 10),
+    "electron_temperature": np.linspace(2, 10, 10),
+    "plasm_potential": np.linspace(50, 195, 10),
+    "volume_flow": np.linspace(0.3e-6, 1.0e-6, 10),
+}
+BASE = {
+    "electron_current": 0.5,
+    "ion_current": 2.19,
+    "elastic_en_time": 1.84e-7,
+    "nonelastic_en_time": 2.44e-6,
+    "neutral_concentration": 2.84e18,
+}
+
+
+def _columns(directory):
+    store = ColumnStore(directory)
+    return {name: np.array(store.column(name)) for name in SWEEP_OUTPUTS}
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_parallel_sweep_matches_serial_bit_for_bit(tmp_path, dtype):
+    # маленький бюджет памяти: десятки частей, границы частей разные при разном числе процессов
+    run_sweep(AXES, BASE, tmp_path / "serial", max_memory_mb=0.05, workers=1, verbose=False, dtype=dtype)
+    serial = _columns(tmp_path / "serial")
+    assert all(np.count_nonzero(serial[name]) == serial[name].size for name in SWEEP_OUTPUTS)
+    for workers in (2, 3):
+        directory = tmp_path / f"workers{workers}"
+        run_sweep(AXES, BASE, directory, max_memory_mb=0.05, workers=workers, verbose=False, dtype=dtype)
+        parallel = _columns(directory)
+        for name in SWEEP_OUTPUTS:
+            assert parallel[name].dtype == serial[name].dtype
+            assert parallel[name].tobytes() == serial[name].tobytes(), (workers, name)
+
+
+def test_sweep_output_does_not_depend_on_chunk_size(tmp_path):
+    run_sweep(AXES, BASE, tmp_path / "small", max_memory_mb=0.05, verbose=False)
+    run_sweep(AXES, BASE, tmp_path / "large", max_memory_mb=256, verbose=False)
+    small, large = _columns(tmp_path / "small"), _columns(tmp_path / "large")
+    for name in SWEEP_OUTPUTS:
+        assert small[name].tobytes() == large[name].tobytes(), name
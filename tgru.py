@@ -1,9 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import constants
-from scipy.optimize import fsolve
 import matplotlib.patches as patches
 
+import emission
+from cs_coverage import solve_coverage
+
 # Константы
 e = constants.e  # Заряд электрона, Кл
 k = constants.k  # Постоянная Больцмана, Дж/К
@@ -32,14 +34,7 @@ print("\n--- ПУНКТ 1: Определение плотности тока --
 # Для построения S-образной кривой используем типичные значения для системы W-Cs
 def S_shaped_curve(T, E):
     """Модель S-образной характеристики для системы W-Cs"""
-    # Типичные параметры для аппроксимации
-    j_sat = 1.0  # А/см² - ток насыщения
-    T_opt = 1200 # K - оптимальная температура
-    width = 200  # K - ширина пика
-    
-    # S-образная зависимость
-    j = j_sat * np.exp(-((T - T_opt)/width)**2) * (1 + 0.1 * np.log10(E/1e5))
-    return j
+    return emission.S_shaped_curve(T, E)
 
 # Строим S-образную диаграмму
 T_range = np.linspace(800, 2000, 100)
@@ -64,17 +59,9 @@ print("\n--- ПУНКТ 2: Определение Δφ ---")
 
 def calculate_delta_phi(j_e, T, A, phi_W):
     """Вычисляет снижение работы выхода из уравнения Ричардсона"""
-    kT_eV = k * T / e  # kT в эВ
-    
     # Решаем уравнение: j_e = A*T²*exp(-(phi_W - Δφ)/(kT))
     # => phi_W - Δφ = -kT * ln(j_e/(A*T²))
-    
-    exponent_arg = j_e / (A * T**2)
-    if exponent_arg <= 0:
-        return phi_W  # Нет снижения
-    
-    delta_phi = phi_W + kT_eV * np.log(exponent_arg)
-    return max(0, delta_phi)  # Δφ не может быть отрицательным
+    return emission.calculate_delta_phi(j_e, T, A, phi_W)[()]
 
 delta_phi = calculate_delta_phi(j_e, T_k, A, phi_W)
 print(f"Снижение работы выхода: Δφ = {delta_phi:.3f} эВ")
@@ -84,10 +71,7 @@ print("\n--- ПУНКТ 3: Определение степени покрыти
 
 def calculate_theta(delta_phi, phi_W, phi_Cs):
     """Вычисляет степень покрытия из уравнения баланса работ выхода"""
-    if phi_W == phi_Cs:
-        return 0
-    theta = delta_phi / (phi_W - phi_Cs)
-    return min(max(theta, 0), 1)  # Ограничиваем от 0 до 1
+    return emission.calculate_theta(delta_phi, phi_W, phi_Cs)[()]
 
 theta = calculate_theta(delta_phi, phi_W, phi_Cs)
 print(f"Степень покрытия: θ = {theta:.3f}")
@@ -161,8 +145,7 @@ print("\n--- ПУНКТ 7: Давление паров цезия ---")
 def calculate_Cs_pressure(T_Cs):
     """Вычисляет давление насыщенных паров цезия"""
     # p_Cs = 2.45e8 * exp(-8910/T_Cs) [мм рт.ст.]
-    p_Cs = 2.45e8 * np.exp(-8910 / T_Cs)
-    return p_Cs
+    return emission.calculate_Cs_pressure(T_Cs)
 
 p_Cs = calculate_Cs_pressure(T_Cs)
 print(f"Давление паров цезия: p_Cs = {p_Cs:.2e} мм рт.ст.")
@@ -173,19 +156,7 @@ print("\n--- ПУНКТ 8: Ток эмиссии с учетом поля ---")
 def emission_current_with_field(T, E, phi_W, delta_phi, A):
     """Вычисляет ток эмиссии с учетом шотки-эффекта"""
     # j = A*T² * exp(-e(φ_W - Δφ - 3.62e-4*sqrt(E))/(kT))
-    
-    kT_eV = k * T / e  # kT в эВ
-    
-    # Снижение барьера за счет поля (эффект Шоттки)
-    delta_phi_field = 3.62e-4 * np.sqrt(E)  # в эВ
-    
-    # Эффективная работа выхода
-    phi_eff = phi_W - delta_phi - delta_phi_field
-    
-    # Плотность тока
-    j = A * T**2 * np.exp(-phi_eff / kT_eV)
-    
-    return j, phi_eff
+    return emission.emission_current_with_field(T, E, phi_W, delta_phi, A)
 
 j_emission, phi_eff = emission_current_with_field(T_k, E_k, phi_W, delta_phi, A)
 print(f"Ток эмиссии с учетом поля: j = {j_emission:.3f} А/см²")
@@ -193,7 +164,7 @@ print(f"Эффективная работа выхода: φ_eff = {phi_eff:.3f}
 
 # Строим зависимость тока эмиссии от поля
 E_range = np.logspace(4, 7, 100)  # В/см
-j_vs_E = [emission_current_with_field(T_k, E, phi_W, delta_phi, A)[0] for E in E_range]
+j_vs_E = emission_current_with_field(T_k, E_range, phi_W, delta_phi, A)[0]
 
 plt.figure(figsize=(10, 6))
 plt.loglog(E_range, j_vs_E, 'b-', linewidth=2)
@@ -220,7 +191,7 @@ print(f"8. Ток эмиссии (с полем): {j_emission:.3f} А/см²")
 print("\n--- ДОПОЛНИТЕЛЬНЫЙ АНАЛИЗ: Зависимость от температуры ---")
 
 T_range_analysis = np.linspace(800, 1500, 50)
-j_vs_T = [emission_current_with_field(T, E_k, phi_W, delta_phi, A)[0] for T in T_range_analysis]
+j_vs_T = emission_current_with_field(T_range_analysis, E_k, phi_W, delta_phi, A)[0]
 
 plt.figure(figsize=(10, 6))
 plt.semilogy(T_range_analysis, j_vs_T, 'purple', linewidth=2)
@@ -230,4 +201,11 @@ plt.ylabel('Плотность тока j (А/см²)', fontsize=12)
 plt.title('Зависимость тока эмиссии от температуры', fontsize=14)
 plt.grid(True, alpha=0.3)
 plt.legend()
-plt.show()
\ No newline at end of file
+plt.show()
+
+# Дополнительный анализ: равновесное покрытие из баланса адсорбции и десорбции
+print("\n--- ДОПОЛНИТЕЛЬНЫЙ АНАЛИЗ: Равновесная степень покрытия ---")
+equilibrium = solve_coverage(T_k, N_i=N_i, E_k=E_k, phi_W=phi_W, phi_Cs=phi_Cs, A=A)
+print(f"Степень покрытия: θ = {equilibrium['theta']:.3f}")
+print(f"Снижение работы выхода: Δφ = {equilibrium['delta_phi']:.3f} эВ")
+print(f"Ток эмиссии (с полем): j = {equilibrium['j']:.3e} А/см²")
@@ -0,0 +1,170 @@
+"""
+Распространение погрешностей измерений через цепочку calculations.py методом Монте-Карло.
+
+Выборки входных величин генерируются частями фиксированного размера и сразу сворачиваются
+в потоковые статистики (среднее, дисперсия, гистограмма для квантилей), поэтому память
+не зависит от числа выборок.
+"""
+import numpy as np
+
+from calculations import MEASUREMENT_INPUTS, _as_columns, compute_plasma_state
+
+# Относительные стандартные отклонения зашумленных входных величин по умолчанию
+DEFAULT_RELATIVE_ERRORS = {
+    "elastic_en_time": 0.1,
+    "nonelastic_en_time": 0.1,
+    "electron_current": 0.05,
+    "ion_current": 0.05,
+    "electron_temperature": 0.1,
+    "neutral_concentration": 0.2,
+}
+
+# Величины, для которых по умолчанию оцениваются доверительные интервалы
+UNCERTAINTY_OUTPUTS = (
+    "electron_hall_parameter",
+    "ion_hall_parameter",
+    "electric_conductivity_longitudal",
+    "electric_conductivity_transversal",
+)
+
+
+class StreamingStats:
+    """
+    Потоковые среднее, дисперсия и гистограмма log10|x| для P точек.
+
+    Положительные и отрицательные значения считаются в отдельных ячейках (и нули — в
+    отдельной), поэтому квантили верны и для величин, выборки которых меняют знак.
+    Диапазон log10|x| задается для каждой точки по первой порции данных с запасом margin
+    декад, значения за его пределами попадают в крайние ячейки своего знака. Нечисловые
+    выборки (NaN, ±inf) в статистики не входят и считаются отдельно (invalid).
+    """
+
+    def __init__(self, points, bins=1024, margin=0.5):
+        self.count = np.zeros(points, dtype=np.int64)
+        self.invalid = np.zeros(points, dtype=np.int64)
+        self.mean = np.zeros(points)
+        self.m2 = np.zeros(points)
+        self.minimum = np.full(points, np.inf)
+        self.maximum = np.full(points, -np.inf)
+        self.bins = bins
+        self.margin = margin
+        # ячейки в порядке возрастания x: отрицательные (|x| убывает), нуль, положительные
+        self.counts = np.zeros((points, 2 * bins + 1), dtype=np.int64)
+        self.low = None
+        self.width = None
+
+    def update(self, x):
+        """Добавляет порцию выборок x формы (P, m)"""
+        valid = np.isfinite(x)
+        m = valid.sum(axis=1)
+        self.invalid += x.shape[1] - m
+        x = np.where(valid, x, 0.0)
+        chunk_mean = x.sum(axis=1) / np.maximum(m, 1)
+        chunk_m2 = (np.where(valid, x - chunk_mean[:, None], 0.0) ** 2).sum(axis=1)
+
+        # объединение моментов двух выборок (формула Чана), для каждой точки свое число выборок
+        total = self.count + m
+        delta = chunk_mean - self.mean
+        self.mean += delta * m / np.maximum(total, 1)
+        self.m2 += chunk_m2 + delta ** 2 * self.count * m / np.maximum(total, 1)
+        self.count = total
+        np.minimum(self.minimum, np.where(valid, x, np.inf).min(axis=1), out=self.minimum)
+        np.maximum(self.maximum, np.where(valid, x, -np.inf).max(axis=1), out=self.maximum)
+
+        with np.errstate(divide="ignore"):
+            log_x = np.log10(np.abs(x))
+        if self.low is None:
+            finite = np.isfinite(log_x) & valid
+            low = np.where(finite, log_x, np.inf).min(axis=1)
+            high = np.where(finite, log_x, -np.inf).max(axis=1)
+            # точки, где в первой порции нет ненулевых значений: диапазон вокруг 1
+            low = np.where(np.isfinite(low), low, 0) - self.margin
+            high = np.where(np.isfinite(high), high, 0) + self.margin
+            self.low = low
+            self.width = (high - low) / self.bins
+        with np.errstate(invalid="ignore"):
+            magnitude = (log_x - self.low[:, None]) / self.width[:, None]
+        np.clip(magnitude, 0, self.bins - 1, out=magnitude)
+        magnitude = magnitude.astype(np.int64)
+        index = np.where(x > 0, self.bins + 1 + magnitude, np.where(x < 0, self.bins - 1 - magnitude, self.bins))
+        index += np.arange(len(self.mean))[:, None] * self.counts.shape[1]
+        # прибавление на месте: время пропорционально числу выборок, а не размеру гистограммы
+        np.add.at(self.counts.reshape(-1), index[valid], 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / np.maximum(1, self.count - 1))
+
+    def quantile(self, q):
+        """Квантиль уровня q по гистограмме (точность — ширина ячейки в log10|x|)"""
+        cdf = np.cumsum(self.counts, axis=1)
+        target = q * self.count
+        # первая ячейка, где накопленное число выборок достигает target
+        index = np.minimum((cdf < target[:, None]).sum(axis=1), self.counts.shape[1] - 1)
+        rows = np.arange(len(index))
+        before = np.where(index > 0, cdf[rows, np.maximum(index - 1, 0)], 0)
+        inside = self.counts[rows, index]
+        fraction = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0.5)
+        # в отрицательных ячейках x растет с убыванием |x|: доля отсчитывается от верхней границы |x|
+        positive = 10 ** (self.low + (index - self.bins - 1 + fraction) * self.width)
+        negative = -10 ** (self.low + (self.bins - index - fraction) * self.width)
+        value = np.where(index > self.bins, positive, np.where(index < self.bins, negative, 0.0))
+        value = np.clip(value, self.minimum, self.maximum)
+        return np.where(self.count > 0, value, np.nan)
+
+
+def propagate(inputs, relative_errors=None, samples=10 ** 6, outputs=UNCERTAINTY_OUTPUTS,
+              quantiles=(0.025, 0.5, 0.975), chunk_points=1 << 18, seed=None):
+    """
+    Монте-Карло оценка распределений величин outputs для каждой из P точек inputs.
+
+    Каждая входная величина из relative_errors умножается на логнормальный множитель
+    с единичным средним и заданным относительным отклонением. На каждую точку
+    приходится samples выборок, за один проход считается не более chunk_points
+    значений. Возвращает {величина: {"mean", "std", "invalid", "quantiles": {q: массив}}};
+    invalid — число нечисловых выборок в каждой точке, не вошедших в статистики.
+    """
+    if relative_errors is None:
+        relative_errors = DEFAULT_RELATIVE_ERRORS
+    columns = _as_columns(inputs)
+    unknown = [name for name in relative_errors if name not in columns]
+    if unknown:
+        raise ValueError(f"Погрешности заданы для величин, которых нет среди входных столбцов: {', '.join(unknown)}")
+    points = max(np.size(columns[name]) for name in columns)
+    columns = {name: np.broadcast_to(value, (points,))[:, None] for name, value in columns.items()}
+    rng = np.random.default_rng(seed)
+    stats = {name: StreamingStats(points) for name in outputs}
+
+    per_chunk = max(1, chunk_points // points)
+    drawn = 0
+    while drawn < samples:
+        m = min(per_chunk, samples - drawn)
+        chunk = {}
+        for name, value in columns.items():
+            if name in relative_errors:
+                sigma = np.sqrt(np.log1p(relative_errors[name] ** 2))
+                noise = np.exp(rng.standard_normal((points, m)) * sigma - sigma ** 2 / 2)
+                chunk[name] = (value * noise).ravel()
+            else:
+                chunk[name] = np.broadcast_to(value, (points, m)).ravel()
+        state = compute_plasma_state(chunk, outputs)
+        for name in outputs:
+            stats[name].update(state[name].reshape(points, m))
+        drawn += m
+
+    return {name: {
+        "mean": s.mean,
+        "std": s.std,
+        "invalid": s.invalid,
+        "quantiles": {q: s.quantile(q) for q in quantiles},
+    } for name, s in stats.items()}
+
+
+if __name__ == "__main__":
+    result = propagate(MEASUREMENT_INPUTS, samples=10 ** 6, seed=0)
+    for name, summary in result.items():
+        print(f"{name}:")
+        low, median, high = summary["quantiles"].values()
+        for i in range(len(summary["mean"])):
+            print(f"  точка {i + 1}: {summary['mean'][i]:.4e} ± {summary['std'][i]:.2e}, "
+                  f"медиана {median[i]:.4e}, 95 % интервал [{low[i]:.4e}, {high[i]:.4e}]")